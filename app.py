@@ -1,12 +1,26 @@
-from flask import Flask, render_template, request, jsonify
-from datetime import date, datetime
+from flask import Flask, render_template, request, jsonify, make_response
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from werkzeug.http import http_date
 
 import psycopg2
 import random
 import os
+import gzip
+import hashlib
+import math
+import threading
+import time
 import pytz
 
+import keypad
+import metrics
+import puzzle_store
+import static_assets
+
 app = Flask(__name__)
+static_assets.init_app(app)  # Fingerprinted, precompressed static/ URLs
+metrics.init_app(app)  # Per-route counters/latency, served at /metrics
 
 # Localize the START_DATE to CST and set it to midnight
 CST = pytz.timezone('America/Chicago')
@@ -15,67 +29,177 @@ START_DATE = CST.localize(START_DATE)  # Localize to CST
 
 WORD_FILE_PATH = "words.txt"
 
-def get_current_word():
-    """Retrieve the word of the day based on Chicago (CST/CDT) time."""
-    chicago_tz = pytz.timezone('America/Chicago')
-    current_date = datetime.now(chicago_tz).strftime('%Y-%m-%d')
-
-    try:
-        with open(WORD_FILE_PATH, 'r') as file:
-            for line in file:
-                date, word = line.strip().split(', ')  # Split date and word by comma
-                if date == current_date:
-                    return word
-        return "ERROR WORD"
-    except FileNotFoundError:
-        return "ERROR WORD"
-
-def get_game_number():
-    """Calculate the game number based on the days elapsed since START_DATE."""
-    today = datetime.now(CST).date()  # Get today's date in CST
-    delta = (today - START_DATE.date()).days  # Ensure we compare only the dates
-    return delta + 1  # Game #1 starts today
+# Loaded once per worker. The file store serves words.bin while it matches
+# words.txt and reads words.txt itself otherwise, reloading on changes;
+# the DB store (PUZZLE_STORE=db) caches each day's answer until rollover.
+store = puzzle_store.from_env(WORD_FILE_PATH)
+
+MISSING_WORD = "ERROR WORD"
 
 def convert_word_to_number(word):
     """Convert a 10-letter word or phrase into a number sequence based on the phone keypad."""
-    keypad = {
-        'a': '2', 'b': '2', 'c': '2',
-        'd': '3', 'e': '3', 'f': '3',
-        'g': '4', 'h': '4', 'i': '4',
-        'j': '5', 'k': '5', 'l': '5',
-        'm': '6', 'n': '6', 'o': '6',
-        'p': '7', 'q': '7', 'r': '7', 's': '7',
-        't': '8', 'u': '8', 'v': '8',
-        'w': '9', 'x': '9', 'y': '9', 'z': '9',
-        ' ': '0'  # Spaces are represented as 0
-    }
-    return ''.join(keypad[char] if char in keypad else '-' for char in word.lower())
+    return keypad.encode(word)
+
+
+@dataclass(frozen=True)
+class PuzzleSnapshot:
+    """Everything the routes need for one Chicago day, computed once."""
+    day: date
+    word: str
+    number_code: str
+    game_number: int
+    display_date: str
+    answer: str
+    expires_at: datetime
+    expires_ts: float
+    schedule_version: tuple
+    missing: bool = False        # Nothing was scheduled when the snapshot was built
+    retry_ts: float = math.inf   # When to look again for a missing phrase
+
+
+def next_rollover(day):
+    """Return the aware datetime of the Chicago midnight that ends ``day``."""
+    return CST.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+
+
+def build_snapshot(now=None):
+    """Build the puzzle snapshot for the Chicago day containing ``now``."""
+    now = now or datetime.now(CST)
+    day = now.astimezone(CST).date()
+    version = store.version
+    word = store.phrase_for(day)
+    missing = word is None
+    word = word or MISSING_WORD
+    number_code = convert_word_to_number(word) if word else "0000000000"
+    expires_at = next_rollover(day)
+    return PuzzleSnapshot(
+        day=day,
+        word=word,
+        number_code=number_code,
+        game_number=(day - START_DATE.date()).days + 1,
+        display_date=day.strftime("%B %d, %Y"),  # Example: February 27, 2025
+        answer=word.upper(),
+        expires_at=expires_at,
+        expires_ts=expires_at.timestamp(),
+        schedule_version=version,
+        missing=missing,
+        # The scheduler may append today's phrase just after rollover; a store
+        # whose version doesn't change on writes (the DB) won't tell us
+        retry_ts=time.time() + puzzle_store.MISS_TTL_SECONDS if missing else math.inf,
+    )
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def _is_stale(snapshot):
+    now = time.time()
+    return (snapshot is None or now >= snapshot.expires_ts or now >= snapshot.retry_ts
+            or snapshot.schedule_version != store.version)
+
+def current_puzzle():
+    """Return today's snapshot, rebuilding it after midnight or a schedule edit."""
+    global _snapshot
+    snapshot = _snapshot
+    store.refresh()
+    if _is_stale(snapshot):
+        with _snapshot_lock:
+            snapshot = _snapshot
+            if _is_stale(snapshot):
+                with metrics.timed('snapshot_rebuild'):  # About once per worker per day
+                    snapshot = build_snapshot()
+                _snapshot = snapshot  # Single reference swap; readers never see a partial object
+    return snapshot
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """Pre-rendered index page for one puzzle, with a gzip copy and ETags."""
+    key: tuple
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    gzip_etag: str
+
+
+_page_cache = None
+_page_lock = threading.Lock()
+
+def render_index_page(puzzle):
+    """Return the cached index page for ``puzzle``, rendering it on first use."""
+    global _page_cache
+    start = time.perf_counter()
+    key = (puzzle.game_number, puzzle.number_code, puzzle.display_date)
+    page = _page_cache
+    if page is not None and page.key == key:
+        metrics.observe_phase('page_cache_hit', time.perf_counter() - start)
+        return page
+
+    with _page_lock:
+        page = _page_cache
+        if page is None or page.key != key:
+            body = render_template(
+                'index.html',
+                number_code=puzzle.number_code,
+                game_number=puzzle.game_number,
+                current_date=puzzle.display_date
+            ).encode('utf-8')
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            page = RenderedPage(
+                key=key,
+                body=body,
+                gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+                etag=digest,
+                gzip_etag=f"{digest}-gz",
+            )
+            _page_cache = page
+    metrics.observe_phase('page_cache_miss', time.perf_counter() - start)
+    return page
 
 
 @app.route('/')
 def index():
     """Render the main game page with the game number and date."""
-    word = get_current_word()
-    number_code = convert_word_to_number(word) if word else "0000000000"
+    with metrics.timed('snapshot'):
+        puzzle = current_puzzle()
+    page = render_index_page(puzzle)
+    with metrics.timed('response_build'):
+        return _page_response(puzzle, page)
 
-    # ✅ Get dynamic game number and formatted date
-    game_number = get_game_number()
-    current_date = date.today().strftime("%B %d, %Y")  # Example: February 27, 2025
 
-    return render_template(
-        'index.html',
-        number_code=number_code,
-        game_number=game_number,
-        current_date=current_date
-    )
+def _page_response(puzzle, page):
+    use_gzip = request.accept_encodings['gzip'] > 0
+    etag = page.gzip_etag if use_gzip else page.etag
+
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(page.gzip_body if use_gzip else page.body)
+        response.mimetype = 'text/html'
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+
+    response.set_etag(etag)
+    if puzzle.missing:
+        # Today's phrase may land any moment; make clients revalidate
+        response.headers['Cache-Control'] = 'no-cache'
+    else:
+        # Browsers and proxies may keep the page until the next puzzle goes live
+        response.headers['Cache-Control'] = (
+            f"public, max-age={max(0, math.floor(puzzle.expires_ts - time.time()))}"
+        )
+        response.headers['Expires'] = http_date(puzzle.expires_at)
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route("/submit", methods=["POST"])
 def submit_guess():
     data = request.get_json()
     guess = data.get("guess", "").upper()
-    correct_word = get_current_word().upper()
+    with metrics.timed('snapshot'):
+        correct_word = current_puzzle().answer
     remaining_attempts = int(data.get("remainingAttempts", 1))  # Defaults to 1 if missing
-    print(remaining_attempts)
 
     if len(guess) != len(correct_word):
         return jsonify({"result": "error", "message": "Invalid guess length"}), 400
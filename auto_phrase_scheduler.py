@@ -4,13 +4,19 @@ Auto Phrase Scheduler
 Automatically monitors word supply and generates new phrases when running low.
 """
 
+import asyncio
 import os
+import random
+import signal
 import sys
-import time
-import schedule
 import logging
 from datetime import datetime, timedelta
+import difficulty
+import word_bank_sync
+from file_watch import FileWatcher
 from phrase_generator import PhraseGenerator
+from puzzle_store import SQLITE_PREFIX, connect_factory, create_sqlite_schema
+from word_schedule import ScheduleIndex
 
 # Set up logging
 logging.basicConfig(
@@ -23,82 +29,76 @@ logging.basicConfig(
 )
 
 class AutoPhraseScheduler:
-    def __init__(self, words_file='words.txt', min_days_ahead=7, generate_count=30):
+    def __init__(self, words_file='words.txt', min_days_ahead=7, generate_count=30, dictionary=None,
+                 workers=1, database_url=None):
         self.words_file = words_file
         self.min_days_ahead = min_days_ahead  # Generate phrases when less than this many days ahead
         self.generate_count = generate_count
-        self.generator = PhraseGenerator()
+        self.generator = PhraseGenerator(dictionary=dictionary)
+        # Kept across checks; each refresh only reads lines appended since the last
+        self.schedule = ScheduleIndex(words_file, check_interval=0)
+        # With a T9 trie built, draw a larger pool and keep a spread of difficulties
+        self.scorer = difficulty.load_scorer(frequency_path=dictionary)
+        self.pool_factor = 5
+        self.workers = workers
+        # With a database, every check imports new lines into word_bank as well
+        self.database_url = database_url
         
     def get_future_phrases_count(self):
         """Count how many phrases are scheduled for future dates"""
-        try:
-            future_count = 0
-            today = datetime.now().date()
-            
-            with open(self.words_file, 'r') as file:
-                for line in file:
-                    if ',' in line:
-                        date_str, phrase = line.strip().split(', ')
-                        try:
-                            phrase_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                            if phrase_date > today:
-                                future_count += 1
-                        except ValueError:
-                            continue
-            
-            return future_count
-        except FileNotFoundError:
+        count = self.schedule.count_after(datetime.now().date())
+        if self.schedule.version is None:
             logging.error(f"Words file {self.words_file} not found")
-            return 0
+        return count
     
     def get_next_available_date(self):
         """Find the next available date for a new phrase"""
-        try:
-            used_dates = set()
-            with open(self.words_file, 'r') as file:
-                for line in file:
-                    if ',' in line:
-                        date_str, phrase = line.strip().split(', ')
-                        used_dates.add(date_str)
-            
-            # Start from tomorrow
-            current_date = datetime.now().date() + timedelta(days=1)
-            
-            # Find the next available date
-            while current_date.strftime('%Y-%m-%d') in used_dates:
-                current_date += timedelta(days=1)
-            
-            return current_date
-            
-        except FileNotFoundError:
-            return datetime.now().date() + timedelta(days=1)
+        # Start from tomorrow
+        return self.schedule.next_free_date(datetime.now().date())
+    
+    def get_gaps_ahead(self):
+        """Free (first, last) date ranges within the next min_days_ahead days"""
+        return self.schedule.free_slots(datetime.now().date(), self.min_days_ahead)
     
     def generate_future_phrases(self):
         """Generate phrases for future dates when running low"""
+        # Other tools may have appended phrases since the last check
+        self.generator.refresh_existing_phrases()
         future_count = self.get_future_phrases_count()
+        gaps = self.get_gaps_ahead()
         
         logging.info(f"Current future phrases: {future_count}")
+        for first, last in gaps:
+            logging.warning(f"No phrase scheduled from {first} to {last}")
         
-        if future_count < self.min_days_ahead:
-            needed = self.generate_count
+        if future_count < self.min_days_ahead or gaps:
+            # Always enough to close every gap inside the window
+            needed = max(self.generate_count, sum((last - first).days + 1 for first, last in gaps))
             logging.info(f"Running low on phrases! Generating {needed} new phrases...")
             
             # Generate new phrases
-            phrases = self.generator.generate_phrases(needed)
+            if self.scorer is not None:
+                pool = self._generate(needed * self.pool_factor)
+                scores = difficulty.select_balanced(self.scorer.score_many(pool), needed)
+                phrases = [score.phrase for score in scores]
+                random.shuffle(phrases)  # Don't schedule a run from easiest to hardest
+            else:
+                phrases = self._generate(needed)
             
             if not phrases:
                 logging.error("Failed to generate new phrases")
                 return
             
-            # Add phrases with future dates
-            start_date = self.get_next_available_date()
+            # Fill gaps first, then extend past the last booked date
+            dates = self.schedule.free_dates(datetime.now().date(), len(phrases))
             added_count = 0
             
-            for i, phrase in enumerate(phrases):
-                date = start_date + timedelta(days=i)
-                date_str = date.strftime('%Y-%m-%d')
-                
-                if self.generator.add_phrase_to_file(phrase, date_str):
+            entries = [(day.strftime('%Y-%m-%d'), phrase) for day, phrase in zip(dates, phrases)]
+            # One locked write for the whole refill
+            written = set(self.generator.add_phrases_to_file(entries))
+            
+            for date_str, phrase in entries:
+                if (date_str, phrase) in written:
                     logging.info(f"Added: {date_str}, {phrase}")
                     added_count += 1
                 else:
@@ -108,12 +108,43 @@ class AutoPhraseScheduler:
             logging.info(f"Now have {self.get_future_phrases_count()} future phrases")
         else:
             logging.info(f"Sufficient phrases available ({future_count} days ahead)")
+        
+        self.sync_database()
+    
+    def sync_database(self):
+        """Import lines appended to words.txt into word_bank and refresh word_today"""
+        if not self.database_url:
+            return
+        try:
+            connect, _ = connect_factory(self.database_url)
+            conn = connect()
+            try:
+                if self.database_url.startswith(SQLITE_PREFIX):
+                    create_sqlite_schema(conn)
+                # Also picks up lines other tools appended since the last import
+                count = word_bank_sync.import_schedule(conn, self.words_file, incremental=True)
+            finally:
+                conn.close()
+        except Exception as e:
+            # words.txt stays the source of truth; the next sync catches up
+            logging.error(f"Failed to sync the database: {e}")
+            return
+        logging.info(f"Synced {count} phrases and today's word to the database")
+    
+    def _generate(self, count):
+        if self.workers > 1:
+            return self.generator.generate_phrases_parallel(count, self.workers)
+        return self.generator.generate_phrases(count)
     
     def daily_check(self):
         """Daily check function to run"""
         logging.info("Running daily phrase check...")
         self.generate_future_phrases()
     
+    def needs_refill(self):
+        """True if fewer than min_days_ahead future dates are booked, or any is missing"""
+        return self.get_future_phrases_count() < self.min_days_ahead or bool(self.get_gaps_ahead())
+    
     def start_scheduler(self, check_interval_hours=24):
         """Start the automated scheduler"""
         logging.info(f"Starting Auto Phrase Scheduler...")
@@ -121,16 +152,80 @@ class AutoPhraseScheduler:
         logging.info(f"Minimum days ahead: {self.min_days_ahead}")
         logging.info(f"Generate count: {self.generate_count}")
         
-        # Schedule daily check
-        schedule.every(check_interval_hours).hours.do(self.daily_check)
+        asyncio.run(self.run_daemon(check_interval_hours))
+    
+    async def run_daemon(self, check_interval_hours=24, settle_seconds=2.0):
+        """Sleep until the next check is due or words.txt changes.
         
-        # Run initial check
-        self.daily_check()
+        A full check runs every ``check_interval_hours``. In between, the
+        stock is re-counted at local midnight (when one future day becomes
+        today) and shortly after any change to the words file, and refilled
+        straight away if it has dropped below min_days_ahead. Our own
+        writes also wake the daemon, but only ever add stock, so the
+        re-count finds nothing to do.
+        """
+        loop = asyncio.get_running_loop()
+        interval = check_interval_hours * 3600
+        changed = asyncio.Event()
+        stopping = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGHUP):
+            try:
+                loop.add_signal_handler(signum, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not available on this platform
         
-        # Keep running
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        watcher = FileWatcher(self.words_file, changed.set)
+        logging.info(f"Watching {self.words_file} ({watcher.start(loop)})")
+        try:
+            await loop.run_in_executor(None, self.daily_check)
+            next_check = loop.time() + interval
+            while not stopping.is_set():
+                now = loop.time()
+                if now >= next_check:
+                    await loop.run_in_executor(None, self.daily_check)
+                    next_check = loop.time() + interval
+                    continue
+                
+                timeout = min(next_check - now, self._seconds_until_midnight())
+                woken_by = await self._wait_for_wake(changed, stopping, timeout)
+                if woken_by is None:
+                    continue
+                if woken_by == 'timeout':
+                    if loop.time() >= next_check:
+                        continue  # Full check at the top of the loop
+                    reason = "the date rolled over"
+                    await loop.run_in_executor(None, self.sync_database)
+                else:
+                    # Let a burst of writes (an editor save, a batch append) settle
+                    await asyncio.sleep(settle_seconds)
+                    changed.clear()
+                    reason = f"{self.words_file} changed"
+                if await loop.run_in_executor(None, self.needs_refill):
+                    logging.info(f"Below {self.min_days_ahead} days ahead after {reason}; refilling now")
+                    await loop.run_in_executor(None, self.generate_future_phrases)
+        finally:
+            watcher.close()
+        logging.info("Scheduler stopped")
+    
+    @staticmethod
+    def _seconds_until_midnight():
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return (midnight - now).total_seconds() + 1  # Land just after the rollover
+    
+    @staticmethod
+    async def _wait_for_wake(changed, stopping, timeout):
+        """Wait up to ``timeout`` seconds. Returns 'changed', 'timeout' or None if stopping."""
+        waiters = [asyncio.ensure_future(changed.wait()), asyncio.ensure_future(stopping.wait())]
+        done, pending = await asyncio.wait(waiters, timeout=timeout,
+                                           return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+        if stopping.is_set():
+            return None
+        if changed.is_set():
+            return 'changed'
+        return 'timeout'
 
 def main():
     import argparse
@@ -145,6 +240,7 @@ Examples:
   python3 auto_phrase_scheduler.py --min-days 14     # Generate when less than 14 days ahead
   python3 auto_phrase_scheduler.py --generate 50     # Generate 50 phrases at a time
   python3 auto_phrase_scheduler.py --interval 12     # Check every 12 hours
+  python3 auto_phrase_scheduler.py --dictionary counts.txt  # Draw words from a large word list
         """
     )
     
@@ -182,12 +278,35 @@ Examples:
         help='Path to words file (default: words.txt)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes to generate on, for batches of 10000+ phrases (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--dictionary',
+        type=str,
+        help="Large word list ('word' or 'word count' per line) to draw words from"
+    )
+    
+    parser.add_argument(
+        '--database-url',
+        type=str,
+        default=os.environ.get('DATABASE_URL'),
+        help='Also import new lines of the words file into word_bank here (default: $DATABASE_URL)'
+    )
+    
     args = parser.parse_args()
     
     scheduler = AutoPhraseScheduler(
         words_file=args.words_file,
         min_days_ahead=args.min_days,
-        generate_count=args.generate
+        generate_count=args.generate,
+        dictionary=args.dictionary,
+        workers=args.workers,
+        database_url=args.database_url
     )
     
     if args.check_now:
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+App Load Benchmark
+Drives / and /submit with a realistic request mix and reports throughput and
+latency percentiles, either in-process through Flask's test client or against
+a locally started gunicorn.
+"""
+
+import contextlib
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytz
+
+from bench_common import (BASELINE_DIR, PROJECT_DIR, find_regressions, latency_summary,
+                          load_baseline, save_baseline)
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, 'app.json')
+CST = pytz.timezone('America/Chicago')
+
+# Metric -> which direction is better, for regression checks
+CHECKS = {
+    'throughput_rps': 'higher',
+    'p95_ms': 'lower',
+    'p99_ms': 'lower',
+}
+
+
+def write_synthetic_schedule(path, lines, future_days=30, seed=0):
+    """Write a words.txt with ``lines`` entries, today near the end like production.
+
+    Returns today's phrase so the benchmark can send correct guesses.
+    """
+    rng = random.Random(seed)
+    today = datetime.now(CST).date()
+    first = today - timedelta(days=max(lines - future_days - 1, 0))
+    letters = string.ascii_lowercase
+    answer = None
+    with open(path, 'w') as file:
+        for i in range(lines):
+            day = first + timedelta(days=i)
+            phrase = ''.join(rng.choice(letters) for _ in range(4)) + ' ' + \
+                ''.join(rng.choice(letters) for _ in range(5))
+            if day == today:
+                answer = phrase
+            file.write(f"{day.isoformat()}, {phrase}\n")
+    return answer
+
+
+def build_request_plan(count, answer, index_ratio, mix, seed=0):
+    """Return a shuffled list of (method, path, body) requests."""
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    plan = []
+    for _ in range(count):
+        if rng.random() < index_ratio:
+            plan.append(('GET', '/', None))
+            continue
+        kind = rng.choices(kinds, weights)[0]
+        if kind == 'correct':
+            guess = answer
+        elif kind == 'partial':
+            chars = list(answer)
+            for i in rng.sample(range(len(chars)), 3):
+                chars[i] = rng.choice(string.ascii_lowercase)
+            guess = ''.join(chars)
+        else:  # wrong_length
+            guess = answer[:rng.randint(1, len(answer) - 1)]
+        body = json.dumps({'guess': guess, 'remainingAttempts': rng.randint(1, 3)})
+        plan.append(('POST', '/submit', body))
+    return plan
+
+
+def _run_plan(plan, concurrency, send):
+    """Run ``plan`` across ``concurrency`` threads. ``send`` returns a status code."""
+    latencies = [0.0] * len(plan)
+    statuses = [0] * len(plan)
+
+    def worker(index):
+        method, path, body = plan[index]
+        start = time.perf_counter()
+        statuses[index] = send(method, path, body)
+        latencies[index] = time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(len(plan))))
+    elapsed = time.perf_counter() - started
+
+    unexpected = sum(
+        1 for (method, path, body), status in zip(plan, statuses)
+        if status not in (200, 400)
+    )
+    result = {
+        'requests': len(plan),
+        'concurrency': concurrency,
+        'throughput_rps': round(len(plan) / elapsed, 1),
+        'errors': unexpected,
+    }
+    result.update(latency_summary(latencies))
+    return result
+
+
+def bench_test_client(workdir, plan, concurrency):
+    """Benchmark in-process through Flask's test client."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    # The app resolves words.txt relative to the working directory
+    os.chdir(workdir)
+    # Keep benchmark requests out of the deployed app's metrics
+    os.environ['METRICS_DIR'] = os.path.join(workdir, 'metrics')
+    for module in ('app', 'metrics'):
+        sys.modules.pop(module, None)
+    import app as app_module
+
+    local = threading.local()
+
+    def send(method, path, body):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app_module.app.test_client()
+        if method == 'GET':
+            response = client.get(path)
+        else:
+            response = client.post(path, data=body, content_type='application/json')
+        status = response.status_code
+        response.close()
+        return status
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        send('GET', '/', None)  # Warm up caches before timing
+        return _run_plan(plan, concurrency, send)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def bench_gunicorn(workdir, plan, concurrency, workers):
+    """Benchmark against a gunicorn started on a free local port."""
+    if shutil.which('gunicorn') is None:
+        raise RuntimeError("gunicorn is not installed")
+    port = _free_port()
+    process = subprocess.Popen(
+        ['gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+         '--chdir', workdir, '--pythonpath', PROJECT_DIR, 'app:app'],
+        env=dict(os.environ, METRICS_DIR=os.path.join(workdir, 'metrics')),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    local = threading.local()
+
+    def send(method, path, body):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        headers = {'Content-Type': 'application/json'} if body else {}
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            local.conn = None
+            return 0
+
+    try:
+        deadline = time.monotonic() + 30
+        while send('GET', '/', None) != 200:
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError("gunicorn did not start")
+            time.sleep(0.2)
+        return _run_plan(plan, concurrency, send)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def parse_mix(text):
+    """Parse 'correct=0.2,partial=0.6,wrong_length=0.2' into a dict."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('correct', 'partial', 'wrong_length'):
+            raise ValueError(f"Unknown guess kind '{name}'")
+        mix[name] = float(weight)
+    return mix
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Load-test / and /submit and track latency baselines",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 benchmarks/app_bench.py                              # Test client, default sizes
+  python3 benchmarks/app_bench.py --mode gunicorn --workers 4  # Real server
+  python3 benchmarks/app_bench.py --sizes 300,10000,100000 -c 16
+  python3 benchmarks/app_bench.py --save                       # Record a new baseline
+  python3 benchmarks/app_bench.py --compare --threshold 0.15   # Fail on >15% regression
+        """
+    )
+    parser.add_argument('--mode', choices=['test-client', 'gunicorn'], default='test-client')
+    parser.add_argument('-n', '--requests', type=int, default=2000,
+                        help='Requests per scenario (default: 2000)')
+    parser.add_argument('-c', '--concurrency', type=str, default='1,8',
+                        help='Comma-separated client thread counts (default: 1,8)')
+    parser.add_argument('--sizes', type=str, default='300,10000',
+                        help='Comma-separated words.txt line counts (default: 300,10000)')
+    parser.add_argument('--index-ratio', type=float, default=0.5,
+                        help='Share of requests that load / (default: 0.5)')
+    parser.add_argument('--mix', type=str, default='correct=0.2,partial=0.6,wrong_length=0.2',
+                        help='Guess mix for /submit requests')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='gunicorn worker processes (default: 2)')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE,
+                        help='Baseline JSON path')
+    parser.add_argument('--save', action='store_true', help='Save results as the new baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='Exit non-zero if results regress past --threshold')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed regression as a fraction (default: 0.2)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    results = {}
+    original_cwd = os.getcwd()
+    for size in (int(s) for s in args.sizes.split(',')):
+        workdir = tempfile.mkdtemp(prefix='dialin-bench-')
+        try:
+            answer = write_synthetic_schedule(os.path.join(workdir, 'words.txt'), size)
+            plan = build_request_plan(args.requests, answer, args.index_ratio, mix)
+            for concurrency in (int(c) for c in args.concurrency.split(',')):
+                if args.mode == 'gunicorn':
+                    result = bench_gunicorn(workdir, plan, concurrency, args.workers)
+                else:
+                    result = bench_test_client(workdir, plan, concurrency)
+                scenario = f"{args.mode}/lines={size}/c={concurrency}"
+                results[scenario] = result
+                if not args.json:
+                    print(f"{scenario}: {result['throughput_rps']} req/s  "
+                          f"p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  "
+                          f"p99 {result['p99_ms']}ms  errors {result['errors']}")
+        finally:
+            os.chdir(original_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    exit_code = 0
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save first")
+        else:
+            regressions = find_regressions(baseline['results'], results, CHECKS, args.threshold)
+            for line in regressions:
+                print(f"REGRESSION {line}")
+            if regressions:
+                exit_code = 1
+            else:
+                print(f"No regressions against baseline from {baseline['commit']}")
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Shared helpers for the benchmark scripts: percentiles, JSON baselines and
+regression checks.
+"""
+
+import json
+import math
+import os
+import subprocess
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'baselines')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def latency_summary(latencies):
+    """Summarize a list of latencies in seconds as milliseconds."""
+    values = sorted(latencies)
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round((values[-1] if values else 0.0) * 1000, 3),
+    }
+
+
+def git_commit():
+    """Return the current short commit hash, or 'unknown' outside git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results, history_key=None):
+    """Write ``results`` as the current baseline.
+
+    When ``history_key`` is given (e.g. a commit hash) the results are also
+    kept under ``history`` so older runs stay comparable.
+    """
+    previous = load_baseline(path) or {}
+    baseline = {
+        'commit': git_commit(),
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+        'history': previous.get('history', {}),
+    }
+    if history_key:
+        baseline['history'][history_key] = results
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def find_regressions(baseline_results, results, checks, threshold):
+    """Compare scenario results against a baseline.
+
+    ``checks`` maps metric name to 'higher' or 'lower' (which direction is
+    better). Returns human-readable lines for every metric that got worse by
+    more than ``threshold`` (a fraction, e.g. 0.2 for 20%).
+    """
+    regressions = []
+    for scenario, metrics in results.items():
+        base = baseline_results.get(scenario)
+        if not base:
+            continue
+        for metric, better in checks.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if better == 'higher' else change
+            if worse > threshold:
+                regressions.append(
+                    f"{scenario}: {metric} {old} -> {new} ({change:+.1%}, limit {threshold:.0%})"
+                )
+    return regressions
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Generator Benchmark
+Measures PhraseGenerator as words.txt fills up: phrases/sec, attempts per
+accepted phrase, how often generate_phrases falls back to raw word
+compositions, and peak memory, against synthetic histories of increasing
+size.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from bench_common import (BASELINE_DIR, PROJECT_DIR, find_regressions, git_commit,
+                          load_baseline, save_baseline)
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, 'generator.json')
+
+# Metric -> which direction is better, for regression checks
+CHECKS = {
+    'phrases_per_sec': 'higher',
+    'attempts_per_phrase': 'lower',
+    'fallback_rate': 'lower',
+    'peak_kib': 'lower',
+}
+
+
+class CountingSet:
+    """Wraps the generator's used-phrase set and counts membership checks."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.lookups = 0
+
+    def __contains__(self, phrase):
+        self.lookups += 1
+        return phrase in self.inner
+
+    def __iter__(self):
+        return iter(self.inner)
+
+    def __len__(self):
+        return len(self.inner)
+
+
+def _import_generator():
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    import phrase_generator
+    return phrase_generator
+
+
+def write_synthetic_history(workdir, used, seed=0):
+    """Write workdir/words.txt with ``used`` phrases from the generator's own
+    candidate space, so later draws really collide with them.
+
+    Changes into ``workdir`` first: the generator reads and indexes
+    words.txt in the working directory.
+    """
+    phrase_generator = _import_generator()
+    os.chdir(workdir)
+    path = os.path.join(workdir, 'words.txt')
+    with open(path, 'w'):
+        pass
+    with _quiet():
+        generator = phrase_generator.PhraseGenerator()
+        phrases = generator.generate_phrases(used, seed=seed)
+    generator.existing_phrases.close()
+    for name in os.listdir(workdir):
+        if name.startswith('words.idx'):
+            os.remove(os.path.join(workdir, name))
+    first = date(2025, 4, 17)
+    with open(path, 'w') as file:
+        for i, phrase in enumerate(phrases):
+            file.write(f"{(first + timedelta(days=i)).isoformat()}, {phrase}\n")
+    return len(phrases)
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def bench_history(workdir, count, singles):
+    """Benchmark one synthetic history in ``workdir`` (must contain words.txt)."""
+    phrase_generator = _import_generator()
+    os.chdir(workdir)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with _quiet():
+        generator = phrase_generator.PhraseGenerator()
+    init_seconds = time.perf_counter() - started
+
+    # Batch path: every membership check on the used set is one attempt
+    counting = CountingSet(generator.candidates.used)
+    generator.candidates.used = counting
+    started = time.perf_counter()
+    phrases = generator.generate_phrases(count, seed=1)
+    batch_seconds = time.perf_counter() - started
+    generator.candidates.used = counting.inner
+    # Phrases that had to come from raw compositions over the word index,
+    # the last resort behind templates, pairs and single words
+    fallbacks = sum(1 for phrase in phrases if phrase in generator.candidates.compositions)
+
+    # Legacy single-phrase path
+    started = time.perf_counter()
+    for _ in range(singles):
+        generator.generate_multi_word_phrase()
+    single_seconds = time.perf_counter() - started
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    generator.existing_phrases.close()
+
+    return {
+        'generated': len(phrases),
+        'init_ms': round(init_seconds * 1000, 3),
+        'phrases_per_sec': round(len(phrases) / batch_seconds, 1) if batch_seconds else 0.0,
+        'attempts_per_phrase': round(counting.lookups / len(phrases), 3) if phrases else 0.0,
+        'single_phrase_us': round(single_seconds / singles * 1e6, 3) if singles else 0.0,
+        'fallback_rate': round(fallbacks / len(phrases), 4) if phrases else 0.0,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark phrase generation against growing histories",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 benchmarks/generator_bench.py                          # 100, 1k and 10k used phrases
+  python3 benchmarks/generator_bench.py --sizes 100,10000,100000 -n 5000
+  python3 benchmarks/generator_bench.py --save                   # Record a baseline for this commit
+  python3 benchmarks/generator_bench.py --compare --threshold 0.15
+        """
+    )
+    parser.add_argument('-n', '--count', type=int, default=1000,
+                        help='Phrases to generate per history (default: 1000)')
+    parser.add_argument('--singles', type=int, default=1000,
+                        help='Calls to generate_multi_word_phrase per history (default: 1000)')
+    parser.add_argument('--sizes', type=str, default='100,1000,10000',
+                        help='Comma-separated used-phrase counts (default: 100,1000,10000)')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE,
+                        help='Baseline JSON path')
+    parser.add_argument('--save', action='store_true',
+                        help='Save results as the new baseline, keyed by commit in its history')
+    parser.add_argument('--compare', action='store_true',
+                        help='Exit non-zero if results regress past --threshold')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed regression as a fraction (default: 0.2)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    original_cwd = os.getcwd()
+    for size in (int(s) for s in args.sizes.split(',')):
+        workdir = tempfile.mkdtemp(prefix='dialin-genbench-')
+        try:
+            used = write_synthetic_history(workdir, size)
+            result = bench_history(workdir, args.count, args.singles)
+            result['history'] = used
+            scenario = f"history={size}/n={args.count}"
+            results[scenario] = result
+            if not args.json:
+                print(f"{scenario}: {result['phrases_per_sec']} phrases/s  "
+                      f"attempts/phrase {result['attempts_per_phrase']}  "
+                      f"fallback {result['fallback_rate']:.1%}  "
+                      f"init {result['init_ms']}ms  peak {result['peak_kib']}KiB")
+        finally:
+            os.chdir(original_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    exit_code = 0
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save first")
+        else:
+            regressions = find_regressions(baseline['results'], results, CHECKS, args.threshold)
+            for line in regressions:
+                print(f"REGRESSION {line}")
+            if regressions:
+                exit_code = 1
+            else:
+                print(f"No regressions against baseline from {baseline['commit']}")
+
+    if args.save:
+        save_baseline(args.baseline, results, history_key=git_commit())
+        print(f"Saved baseline to {args.baseline}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
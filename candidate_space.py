@@ -0,0 +1,339 @@
+"""
+Candidate Space
+Lazy enumeration of every 10-character phrase the generator can build, with
+sampling without replacement and an exact count of unused candidates.
+"""
+
+import random
+from itertools import product
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+PHRASE_LENGTH = 10
+MAX_WORDS = 4
+
+# Share of draws taken from the single-word tier, as in the original generator
+SINGLE_WORD_RATIO = 0.2
+
+
+class Partition(NamedTuple):
+    """Share ``index`` of ``count`` of every space's random order.
+
+    All parts walk the same permutation (keyed from ``seed`` rather than the
+    caller's rng) but take every ``count``-th position, so parts never
+    overlap and together cover the whole space.
+    """
+    index: int = 0
+    count: int = 1
+    seed: Optional[int] = None
+
+    def key_rng(self, size: int, rng: random.Random) -> random.Random:
+        if self.seed is None:
+            return rng
+        return random.Random(f"{self.seed}:{size}")
+
+    def share(self, size: int) -> int:
+        """Approximate number of a space's items that fall in this part."""
+        return -(-size // self.count)
+
+
+WHOLE = Partition()
+
+
+def shuffled_range(size: int, rng: random.Random, partition: Partition = WHOLE) -> Iterator[int]:
+    """Yield 0..size-1 in random order using O(1) memory.
+
+    A keyed bijection on the next power of two is walked in counter order and
+    results outside the range are skipped (cycle walking), so every index is
+    produced exactly once and nothing is materialised. With a ``partition``
+    only its stride of counters is walked.
+    """
+    if size <= 0:
+        return
+    bits = max((size - 1).bit_length(), 1)
+    mask = (1 << bits) - 1
+    shift = max(bits // 2, 1)
+    # xorshift, odd multiply and add are each invertible modulo 2**bits
+    key_rng = partition.key_rng(size, rng)
+    keys = [(key_rng.getrandbits(bits) | 1, key_rng.getrandbits(bits)) for _ in range(3)]
+    for counter in range(partition.index, mask + 1, partition.count):
+        x = counter
+        for multiplier, offset in keys:
+            x ^= x >> shift
+            x = (x * multiplier + offset) & mask
+        if x < size:
+            yield x
+
+
+def length_compositions(lengths: Iterable[int], max_words: int = MAX_WORDS,
+                        phrase_length: int = PHRASE_LENGTH) -> List[Tuple[int, ...]]:
+    """Return every sequence of word lengths that spells a phrase of ``phrase_length``.
+
+    Words are separated by single spaces, so k words need letters summing to
+    phrase_length - (k - 1). Shorter compositions come first.
+    """
+    lengths = sorted(set(lengths))
+    compositions = []
+    for word_count in range(1, max_words + 1):
+        letters = phrase_length - (word_count - 1)
+        for combo in product(lengths, repeat=word_count):
+            if sum(combo) == letters:
+                compositions.append(combo)
+    return compositions
+
+
+class PhraseListSpace:
+    """A fixed list of phrases (templates, single words)."""
+
+    def __init__(self, phrases: Iterable[str], claimed: Set[str] = frozenset()):
+        unique = dict.fromkeys(p.lower() for p in phrases if len(p) == PHRASE_LENGTH)
+        self.phrases = tuple(p for p in unique if p not in claimed)
+        self._members = frozenset(self.phrases)
+        self.size = len(self.phrases)
+
+    def __contains__(self, phrase: str) -> bool:
+        return phrase in self._members
+
+    def iter_random(self, rng: random.Random, partition: Partition = WHOLE) -> Iterator[str]:
+        for index in shuffled_range(self.size, rng, partition):
+            yield self.phrases[index]
+
+
+class UnusedPool:
+    """A set of phrases with O(1) random pick and O(1) removal.
+
+    Items live in a list with a phrase -> position index; removing swaps the
+    last item into the hole, so the list never needs rebuilding.
+    """
+
+    def __init__(self, phrases: Iterable[str] = (), used: Set[str] = frozenset()):
+        self._items = []
+        self._positions = {}
+        for phrase in phrases:
+            phrase = phrase.lower()
+            if phrase not in used:
+                self.add(phrase)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, phrase: str) -> bool:
+        return phrase in self._positions
+
+    def add(self, phrase: str) -> None:
+        if phrase not in self._positions:
+            self._positions[phrase] = len(self._items)
+            self._items.append(phrase)
+
+    def discard(self, phrase: str) -> None:
+        position = self._positions.pop(phrase, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+
+    def pick(self, rng: random.Random = random) -> Optional[str]:
+        """Return a random phrase without removing it, or None when empty."""
+        if not self._items:
+            return None
+        return self._items[rng.randrange(len(self._items))]
+
+
+class CompositionSpace:
+    """Every phrase with one word per slot for a fixed sequence of word buckets.
+
+    Candidates are addressed by a mixed-radix index over the slot buckets, so
+    the cross product is never built. Phrases already owned by an earlier
+    space are excluded from both the size and the iteration: listed ones via
+    ``claimed``, whole composition spaces via ``excluded``.
+    """
+
+    def __init__(self, buckets: Sequence[Tuple[str, ...]], claimed: Set[str] = frozenset(),
+                 excluded: Iterable['CompositionSpace'] = ()):
+        self.buckets = tuple(buckets)
+        # Plain tuples get a set for lookups; other buckets (e.g. the
+        # dictionary's LengthBucket) answer ``in`` themselves
+        self._members = tuple(frozenset(b) if isinstance(b, (tuple, list)) else b
+                              for b in self.buckets)
+        self.total = 1
+        for bucket in self.buckets:
+            self.total *= len(bucket)
+        self.claimed = frozenset(p for p in claimed if self._composes(p))
+        # Only spaces with the same number of words can overlap this one
+        self.excluded = tuple(space for space in excluded if len(space.buckets) == len(self.buckets))
+        overlap = sum(self._overlap(space) for space in self.excluded)
+        # Claimed phrases inside an excluded space are already subtracted
+        overlap -= sum(1 for p in self.claimed if any(s._composes(p) for s in self.excluded))
+        self.size = self.total - len(self.claimed) - overlap
+
+    def _composes(self, phrase: str) -> bool:
+        parts = phrase.split(' ')
+        return (len(parts) == len(self.buckets)
+                and all(part in members for part, members in zip(parts, self._members)))
+
+    def _overlap(self, other: 'CompositionSpace') -> int:
+        """Number of phrases both spaces can compose, claimed or not."""
+        count = 1
+        for mine, my_members, theirs, their_members in zip(
+                self.buckets, self._members, other.buckets, other._members):
+            # Walk the smaller bucket and look words up in the larger one
+            if len(mine) > len(theirs):
+                mine, their_members = theirs, my_members
+            count *= sum(1 for word in mine if word in their_members)
+            if not count:
+                break
+        return count
+
+    def _excludes(self, phrase: str) -> bool:
+        return phrase in self.claimed or any(space._composes(phrase) for space in self.excluded)
+
+    def __contains__(self, phrase: str) -> bool:
+        return self._composes(phrase) and not self._excludes(phrase)
+
+    def phrase_at(self, index: int) -> str:
+        parts = []
+        for bucket in self.buckets:
+            index, offset = divmod(index, len(bucket))
+            parts.append(bucket[offset])
+        return ' '.join(parts)
+
+    def iter_random(self, rng: random.Random, partition: Partition = WHOLE) -> Iterator[str]:
+        for index in shuffled_range(self.total, rng, partition):
+            phrase = self.phrase_at(index)
+            if not self._excludes(phrase):
+                yield phrase
+
+
+class CandidateTier:
+    """An ordered chain of disjoint spaces drawn from one after another."""
+
+    def __init__(self, spaces):
+        self.spaces = [space for space in spaces if space.size > 0]
+        self.size = sum(space.size for space in self.spaces)
+
+    def __contains__(self, phrase: str) -> bool:
+        return any(phrase in space for space in self.spaces)
+
+    def iter_random(self, rng: random.Random, partition: Partition = WHOLE) -> Iterator[str]:
+        for space in self.spaces:
+            yield from space.iter_random(rng, partition)
+
+
+class CandidateUnion:
+    """Disjoint spaces sampled together, uniformly over their union.
+
+    Each draw picks a space with probability proportional to how many of its
+    candidates are still to come, so no single word-length pattern dominates
+    the start of the stream.
+    """
+
+    def __init__(self, spaces):
+        self.spaces = [space for space in spaces if space.size > 0]
+        self.size = sum(space.size for space in self.spaces)
+
+    def __contains__(self, phrase: str) -> bool:
+        return any(phrase in space for space in self.spaces)
+
+    def iter_random(self, rng: random.Random, partition: Partition = WHOLE) -> Iterator[str]:
+        streams = [space.iter_random(rng, partition) for space in self.spaces]
+        left = [partition.share(space.size) for space in self.spaces]
+        total = sum(left)
+        while total > 0:
+            target = rng.randrange(total)
+            index = 0
+            while target >= left[index]:
+                target -= left[index]
+                index += 1
+            left[index] -= 1
+            total -= 1
+            phrase = next(streams[index], None)
+            if phrase is not None:
+                yield phrase
+        # A part's real share can differ slightly from the estimate
+        for stream in streams:
+            yield from stream
+
+
+class CandidateEnumerator:
+    """Lazily enumerates the unused 10-character candidates.
+
+    ``single_words`` plus any 10-letter words in ``words_by_length`` form one
+    tier. The other is drawn in order of preference: ``fixed_phrases``
+    (curated templates), then the ``pair_buckets`` spaces (e.g. adjective +
+    noun, one bucket per word slot), and only once those are used up the raw
+    compositions over ``words_by_length``, fewest words first. All spaces are
+    disjoint, so ``remaining`` is exact. ``used`` is shared with the caller
+    (normally the generator's existing_phrases) and is consulted on every
+    draw.
+    """
+
+    def __init__(self, words_by_length: Dict[int, Tuple[str, ...]],
+                 single_words: Iterable[str] = (), fixed_phrases: Iterable[str] = (),
+                 pair_buckets: Iterable[Sequence[Tuple[str, ...]]] = (),
+                 used: Optional[Set[str]] = None, max_words: int = MAX_WORDS):
+        self.used = used if used is not None else set()
+
+        single = PhraseListSpace(single_words)
+        claimed = set(single.phrases)
+        self.fixed = PhraseListSpace(fixed_phrases, claimed)
+        claimed.update(self.fixed.phrases)
+        pair_spaces = [CompositionSpace(buckets, claimed) for buckets in pair_buckets]
+        self.pairs = CandidateUnion(pair_spaces)
+
+        by_word_count = {}
+        word_lengths = [length for length, words in words_by_length.items() if words]
+        for composition in length_compositions(word_lengths, max_words):
+            by_word_count.setdefault(len(composition), []).append(CompositionSpace(
+                [words_by_length[n] for n in composition], claimed, excluded=pair_spaces))
+
+        # Indexed 10-letter words not already listed join the single-word tier
+        self.single_tier = CandidateTier([single] + by_word_count.pop(1, []))
+        # Raw compositions over the word index read as word salad ('after
+        # hand'), so they are a last resort behind every curated phrase and
+        # pair; within each word count every length pattern is mixed uniformly
+        self.compositions = CandidateTier(
+            [CandidateUnion(spaces) for _, spaces in sorted(by_word_count.items())]
+        )
+        self.multi_tier = CandidateTier([self.fixed, self.pairs, self.compositions])
+        self.size = self.single_tier.size + self.multi_tier.size
+        # Counted on first use, so construction doesn't scan the whole history
+        self._used_count = None
+
+    def __contains__(self, phrase: str) -> bool:
+        return phrase in self.single_tier or phrase in self.multi_tier
+
+    def mark_used(self, phrase: str) -> None:
+        """Record that ``phrase`` was just added to ``used``."""
+        phrase = phrase.lower()
+        if self._used_count is not None and phrase in self:
+            self._used_count += 1
+
+    @property
+    def remaining(self) -> int:
+        """Exact number of candidates not yet in ``used``."""
+        if self._used_count is None:
+            self._used_count = sum(1 for phrase in self.used if phrase in self)
+        return self.size - self._used_count
+
+    def iter_unused(self, rng: Optional[random.Random] = None,
+                    partition: Partition = WHOLE) -> Iterator[str]:
+        """Yield unused candidates in random order, each at most once.
+
+        Streams for different parts of the same seeded ``partition`` are
+        disjoint, so they can be drawn in separate processes and merged.
+        """
+        rng = rng or random.Random(random.getrandbits(64))
+        streams = [self.single_tier.iter_random(rng, partition),
+                   self.multi_tier.iter_random(rng, partition)]
+        weights = [SINGLE_WORD_RATIO, 1 - SINGLE_WORD_RATIO]
+        while streams:
+            pick = 0 if len(streams) == 1 else int(rng.random() >= weights[0])
+            try:
+                phrase = next(streams[pick])
+            except StopIteration:
+                del streams[pick]
+                del weights[pick]
+                continue
+            if phrase not in self.used:
+                yield phrase
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Compiled Schedule
+Fixed-width binary copy of words.txt, indexed by day offset from START_DATE
+and opened with mmap so every gunicorn worker shares the same pages.
+
+Layout (little-endian):
+  header  magic(8) version(H) record_width(H) start_ordinal(I) count(I)
+          source_size(Q) source_mtime_ns(Q)
+  records count * record_width bytes; record i is the phrase for
+          START_DATE + i days (game number i + 1), all zero bytes if unset
+
+words.txt stays the editable source; recompile after editing it.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from datetime import date, timedelta
+
+MAGIC = b'DIALSCH\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIIQQ')
+RECORD_WIDTH = 10
+
+# Must match START_DATE in app.py (game #1)
+START_DATE = date(2025, 4, 17)
+
+DEFAULT_OUTPUT = 'words.bin'
+
+
+def _parse_text(words_file, start_date, record_width, warnings):
+    """Yield (line_number, date, phrase) for each entry that fits the binary format.
+
+    Lines that don't are skipped, with a message appended to ``warnings``,
+    so one bad entry never blocks the rest of the schedule.
+    """
+    with open(words_file, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            where = f"{words_file}:{line_number}"
+            date_str, sep, phrase = line.partition(', ')
+            try:
+                day = date.fromisoformat(date_str) if sep else None
+            except ValueError:
+                day = None
+            if day is None:
+                warnings.append(f"{where}: expected 'YYYY-MM-DD, phrase', skipping")
+            elif day < start_date:
+                warnings.append(f"{where}: {day} is before {start_date}, skipping")
+            elif len(phrase.encode('utf-8')) != record_width:
+                warnings.append(f"{where}: '{phrase}' is {len(phrase.encode('utf-8'))} bytes, "
+                                f"expected {record_width}, skipping")
+            else:
+                yield line_number, day, phrase
+
+
+def compile_schedule(words_file='words.txt', output=DEFAULT_OUTPUT,
+                     start_date=START_DATE, record_width=RECORD_WIDTH):
+    """Compile ``words_file`` into the fixed-width binary format.
+
+    Returns (slots, warnings): the number of day slots written and a list of
+    the lines that were skipped: malformed ones, dates before ``start_date``,
+    phrases that aren't ``record_width`` bytes, and duplicate dates (the
+    first entry for a date wins, matching the web app). The output is written to a temporary file and
+    swapped in with os.replace(), so processes that already mapped the old
+    file keep a consistent view.
+    """
+    st = os.stat(words_file)
+    records = {}
+    warnings = []
+    for line_number, day, phrase in _parse_text(words_file, start_date, record_width, warnings):
+        offset = (day - start_date).days
+        if offset in records:
+            warnings.append(f"{words_file}:{line_number}: duplicate date {day}, keeping first entry")
+            continue
+        records[offset] = phrase.encode('utf-8')
+
+    count = max(records) + 1 if records else 0
+    body = bytearray(count * record_width)
+    for offset, encoded in records.items():
+        body[offset * record_width:(offset + 1) * record_width] = encoded
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, record_width, start_date.toordinal(),
+                         count, st.st_size, st.st_mtime_ns)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(body)
+    os.replace(tmp_path, output)
+    return count, warnings
+
+
+class CompiledSchedule:
+    """Read-only, memory-mapped view of a compiled schedule file."""
+
+    def __init__(self, path=DEFAULT_OUTPUT):
+        self.path = path
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: truncated header")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.record_width, start_ordinal, self.count,
+         self.source_size, self.source_mtime_ns) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: not a compiled schedule (version {FORMAT_VERSION})")
+        if size != HEADER.size + self.count * self.record_width:
+            self._map.close()
+            raise ValueError(f"{path}: size does not match header")
+        self.start_date = date.fromordinal(start_ordinal)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def phrase_for_game(self, game_number):
+        """Return the phrase for game ``game_number`` (1-based), or None."""
+        index = game_number - 1
+        if not 0 <= index < self.count:
+            return None
+        start = HEADER.size + index * self.record_width
+        record = self._map[start:start + self.record_width]
+        if not record.strip(b'\x00'):
+            return None
+        return record.decode('utf-8')
+
+    def phrase_for_date(self, day):
+        """Return the phrase scheduled for ``day`` (a date), or None."""
+        return self.phrase_for_game((day - self.start_date).days + 1)
+
+    def items(self):
+        """Yield (date, phrase) for every filled slot, in date order."""
+        for index in range(self.count):
+            phrase = self.phrase_for_game(index + 1)
+            if phrase is not None:
+                yield self.start_date + timedelta(days=index), phrase
+
+    def is_stale(self, words_file='words.txt'):
+        """Return True if ``words_file`` changed since this file was compiled."""
+        try:
+            st = os.stat(words_file)
+        except FileNotFoundError:
+            return True
+        return (st.st_size, st.st_mtime_ns) != (self.source_size, self.source_mtime_ns)
+
+
+def verify_schedule(words_file='words.txt', compiled=DEFAULT_OUTPUT):
+    """Compare a compiled schedule against its text source. Returns a list of problems.
+
+    Lines that compile_schedule skips are skipped here too.
+    """
+    problems = []
+    with CompiledSchedule(compiled) as schedule:
+        if schedule.is_stale(words_file):
+            problems.append(f"{compiled} is older than {words_file}; recompile")
+        expected = {}
+        for line_number, day, phrase in _parse_text(words_file, schedule.start_date,
+                                                     schedule.record_width, []):
+            if day in expected:
+                continue
+            expected[day] = phrase
+            actual = schedule.phrase_for_date(day)
+            if actual != phrase:
+                problems.append(f"{words_file}:{line_number}: {day} is '{phrase}' but compiled has '{actual}'")
+        for day, phrase in schedule.items():
+            if day not in expected:
+                problems.append(f"{compiled}: {day} '{phrase}' is not in {words_file}")
+    return problems
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compile words.txt into a memory-mappable binary schedule",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 compiled_schedule.py compile              # words.txt -> words.bin
+  python3 compiled_schedule.py verify               # Check words.bin matches words.txt
+  python3 compiled_schedule.py lookup 42            # Print the phrase for game #42
+        """
+    )
+    parser.add_argument('command', choices=['compile', 'verify', 'lookup'])
+    parser.add_argument('game_number', type=int, nargs='?', help='Game number for lookup')
+    parser.add_argument(
+        '--words-file',
+        type=str,
+        default='words.txt',
+        help='Path to words file (default: words.txt)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=DEFAULT_OUTPUT,
+        help=f'Path to compiled schedule (default: {DEFAULT_OUTPUT})'
+    )
+    args = parser.parse_args()
+
+    if args.command == 'compile':
+        count, warnings = compile_schedule(args.words_file, args.output)
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        print(f"Compiled {count} day slots into {args.output}")
+    elif args.command == 'verify':
+        problems = verify_schedule(args.words_file, args.output)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print(f"{args.output} matches {args.words_file}")
+    else:
+        if args.game_number is None:
+            parser.error("lookup needs a game number")
+        with CompiledSchedule(args.output) as schedule:
+            phrase = schedule.phrase_for_game(args.game_number)
+        if phrase is None:
+            print(f"No phrase for game #{args.game_number}")
+            sys.exit(1)
+        print(phrase)
+
+
+if __name__ == "__main__":
+    main()
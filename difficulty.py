@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Difficulty
+Keypad-ambiguity scoring for candidate phrases.
+
+A phrase is harder when many other dictionary phrases share its digit code
+(the player cannot tell them apart from the code alone), when its keys carry
+more letters, and when its words are rare or missing from the dictionary.
+Collision counts come from the T9 trie and are cached per digit code, so a
+pool full of repeated codes only pays for each code once.
+"""
+
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import keypad
+from t9_trie import DEFAULT_OUTPUT as DEFAULT_TRIE, T9Trie
+from word_dictionary import open_dictionary
+
+# Points per term; each is 0 at its easiest. No collisions means the words
+# are missing from the trie, which makes them rare rather than easy, so a
+# zero collision term never leaves the score at 0 on its own.
+COLLISION_WEIGHT = 1.0   # per doubling of the phrases sharing the code
+BRANCHING_WEIGHT = 3.0   # 3 letters on every key pressed (0) to 4 (3 points)
+RARITY_WEIGHT = 3.0      # very common words (near 0) to unknown words (3 points)
+
+
+@dataclass(frozen=True)
+class Score:
+    """Difficulty details for one phrase."""
+    phrase: str
+    code: str
+    phrase_collisions: int   # Dictionary phrases with this exact code
+    word_collisions: int     # Dictionary words sharing each word's code, summed
+    branching: float         # Mean letters per key pressed (3 or 4 each)
+    frequency: Optional[float]  # Mean log10(count + 1) of the words, if known
+    difficulty: float
+
+
+# Letters available on each digit, e.g. '7' -> 4
+_KEY_LETTERS = {digit: len(letters) for digit, letters in keypad.DIGIT_LETTERS.items()}
+
+
+class DifficultyScorer:
+    """Scores phrases against a T9 trie and optional word frequencies.
+
+    ``frequencies`` is anything with a dict-style ``get(word, default)``,
+    such as a word_dictionary.WordDictionary.
+    """
+
+    def __init__(self, trie: T9Trie, frequencies=None):
+        self.trie = trie
+        self.frequencies = frequencies
+        self._by_code = {}
+
+    def _code_stats(self, code: str):
+        stats = self._by_code.get(code)
+        if stats is None:
+            segments = [s for s in code.split(keypad.KEYPAD[' ']) if s]
+            keys = [_KEY_LETTERS.get(digit, 0) for segment in segments for digit in segment]
+            word_counts = [self.trie.word_count_for(segment) for segment in segments]
+            stats = self._by_code[code] = (
+                self.trie.count_phrases(code),
+                sum(word_counts),
+                sum(keys) / len(keys) if keys else 0.0,
+                # Share of words no dictionary word spells, for scoring without frequencies
+                word_counts.count(0) / len(word_counts) if word_counts else 0.0,
+            )
+        return stats
+
+    def _frequency(self, phrase: str) -> Optional[float]:
+        if self.frequencies is None:
+            return None
+        words = phrase.split()
+        if not words:
+            return 0.0
+        return sum(math.log10(self.frequencies.get(word, 0) + 1) for word in words) / len(words)
+
+    def _score(self, phrase: str, code: str) -> Score:
+        phrase_collisions, word_collisions, branching, unknown = self._code_stats(code)
+        frequency = self._frequency(phrase)
+        rarity = unknown if frequency is None else 1 / (1 + frequency)
+        difficulty = (COLLISION_WEIGHT * math.log2(max(phrase_collisions, 1))
+                      + BRANCHING_WEIGHT * max(branching - 3, 0)
+                      + RARITY_WEIGHT * rarity)
+        return Score(phrase, code, phrase_collisions, word_collisions,
+                     round(branching, 3), frequency, round(difficulty, 4))
+
+    def score(self, phrase: str) -> Score:
+        return self._score(phrase.lower(), keypad.encode(phrase))
+
+    def score_many(self, phrases: Iterable[str]) -> List[Score]:
+        """Score a batch, encoding every phrase in one pass."""
+        phrases = [phrase.lower() for phrase in phrases]
+        return [self._score(phrase, code)
+                for phrase, code in zip(phrases, keypad.encode_many(phrases))]
+
+
+def select_balanced(scores: List[Score], count: int) -> List[Score]:
+    """Pick ``count`` scores spread evenly from easiest to hardest."""
+    ranked = sorted(scores, key=lambda score: score.difficulty)
+    if count >= len(ranked):
+        return ranked
+    if count <= 0:
+        return []
+    step = len(ranked) / count
+    return [ranked[int(i * step + step / 2)] for i in range(count)]
+
+
+def load_scorer(trie_path: str = DEFAULT_TRIE, frequency_path: Optional[str] = None):
+    """Open a scorer from files on disk, or return None if no trie is built."""
+    if not os.path.exists(trie_path):
+        return None
+    frequencies = open_dictionary(frequency_path) if frequency_path else None
+    return DifficultyScorer(T9Trie(trie_path), frequencies)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Score phrases by keypad ambiguity",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 difficulty.py "hello world" "good night"      # Score some phrases
+  cut -d, -f2 words.txt | python3 difficulty.py -        # Phrases from stdin
+  python3 difficulty.py --frequencies counts.txt "pizza time"
+        """
+    )
+    parser.add_argument('phrases', nargs='+', help="Phrases to score, or '-' to read stdin")
+    parser.add_argument(
+        '--trie',
+        type=str,
+        default=DEFAULT_TRIE,
+        help=f'Path to the T9 trie (default: {DEFAULT_TRIE})'
+    )
+    parser.add_argument('--frequencies', type=str, help="Word frequency file of 'word count' lines")
+    args = parser.parse_args()
+
+    scorer = load_scorer(args.trie, args.frequencies)
+    if scorer is None:
+        print(f"Error: {args.trie} not found; build it with 't9_trie.py build'")
+        sys.exit(1)
+
+    phrases = args.phrases
+    if phrases == ['-']:
+        phrases = [line.strip() for line in sys.stdin if line.strip()]
+    for score in sorted(scorer.score_many(phrases), key=lambda s: s.difficulty):
+        frequency = '-' if score.frequency is None else f"{score.frequency:.2f}"
+        print(f"{score.difficulty:7.3f}  '{score.phrase}'  code {score.code}  "
+              f"phrases {score.phrase_collisions}  words {score.word_collisions}  "
+              f"branching {score.branching}  frequency {frequency}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+File Watch
+Asyncio notification when one file is written, replaced or removed.
+
+On Linux the file's directory is watched with inotify (through libc, no
+extra packages), so renames onto the file and fresh creations are seen as
+well as in-place writes. Elsewhere, or if inotify is unavailable, the file
+is polled with os.stat() every few seconds instead.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+def _load_inotify():
+    """Return libc if it has inotify, else None."""
+    if not hasattr(os, 'uname') or os.uname().sysname != 'Linux':
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class FileWatcher:
+    """Calls ``callback()`` on the event loop whenever ``path`` may have changed.
+
+    Notifications are hints: several can arrive for one write, and callers
+    should re-check the file rather than trust the count.
+    """
+
+    def __init__(self, path, callback, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.mode = None
+        self._loop = None
+        self._fd = None
+        self._poll_task = None
+        self._name = os.fsencode(os.path.basename(self.path))
+
+    def start(self, loop):
+        """Begin watching. Returns 'inotify' or 'poll'."""
+        self._loop = loop
+        if self._start_inotify():
+            self.mode = 'inotify'
+        else:
+            self._poll_task = loop.create_task(self._poll())
+            self.mode = 'poll'
+        return self.mode
+
+    def _start_inotify(self):
+        libc = _load_inotify()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logging.warning(f"inotify unavailable ({os.strerror(ctypes.get_errno())}); polling")
+            return False
+        directory = os.fsencode(os.path.dirname(self.path))
+        if libc.inotify_add_watch(fd, directory, WATCH_MASK) < 0:
+            logging.warning(f"Cannot watch {os.fsdecode(directory)} "
+                            f"({os.strerror(ctypes.get_errno())}); polling")
+            os.close(fd)
+            return False
+        self._fd = fd
+        self._loop.add_reader(fd, self._read_events)
+        return True
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return
+            raise
+        relevant = False
+        offset = 0
+        while offset + EVENT.size <= len(data):
+            _, mask, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b'\x00')
+            offset += EVENT.size + length
+            # An overflowed queue may have dropped events for our file
+            if mask & IN_Q_OVERFLOW or name == self._name:
+                relevant = True
+        if relevant:
+            self.callback()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    async def _poll(self):
+        last = self._stat()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = self._stat()
+            if current != last:
+                last = current
+                self.callback()
+
+    def close(self):
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
@@ -8,6 +8,7 @@ import argparse
 import sys
 from datetime import datetime, timedelta
 from phrase_generator import PhraseGenerator
+from word_schedule import ScheduleIndex
 
 def main():
     parser = argparse.ArgumentParser(
@@ -20,6 +21,9 @@ Examples:
   python generate_phrases.py --add-to-file     # Add generated phrases to words.txt
   python generate_phrases.py --validate "hello world"  # Validate a phrase
   python generate_phrases.py --future-dates    # Generate phrases with future dates
+  python generate_phrases.py --dictionary counts.txt  # Draw words from a large word list
+  python generate_phrases.py -n 5 --seed 7               # Reproducible batch
+  python generate_phrases.py -n 50000 --workers 8 --seed 7  # Large batch on 8 processes
         """
     )
     
@@ -45,13 +49,13 @@ Examples:
     parser.add_argument(
         '--future-dates',
         action='store_true',
-        help='Generate phrases with future dates (starting from tomorrow)'
+        help='Generate phrases with future dates (first free dates from tomorrow)'
     )
     
     parser.add_argument(
         '--start-date',
         type=str,
-        help='Start date for future phrases (YYYY-MM-DD format)'
+        help='Start date for future phrases (YYYY-MM-DD format); booked dates are skipped'
     )
     
     parser.add_argument(
@@ -60,9 +64,28 @@ Examples:
         help='Preview phrases without adding to file'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes to generate on, for batches of 10000+ phrases (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for a reproducible batch'
+    )
+    
+    parser.add_argument(
+        '--dictionary',
+        type=str,
+        help="Large word list ('word' or 'word count' per line) to draw words from"
+    )
+    
     args = parser.parse_args()
     
-    generator = PhraseGenerator()
+    generator = PhraseGenerator(dictionary=args.dictionary)
     
     # Validate a specific phrase
     if args.validate:
@@ -77,7 +100,12 @@ Examples:
     
     # Generate phrases
     print(f"Generating {args.count} phrases...")
-    phrases = generator.generate_phrases(args.count)
+    if args.workers > 1 or args.seed is not None:
+        # Seeded batches always come from the partitioned draw, so the
+        # same seed gives the same phrases whatever --workers is
+        phrases = generator.generate_phrases_parallel(args.count, args.workers, args.seed)
+    else:
+        phrases = generator.generate_phrases(args.count, seed=args.seed)
     
     if not phrases:
         print("No phrases could be generated. Try increasing the count or check existing phrases.")
@@ -105,12 +133,15 @@ Examples:
             else:
                 start_date = datetime.now() + timedelta(days=1)
             
+            # Skip dates that already have a phrase instead of double-booking them
+            schedule = ScheduleIndex('words.txt', check_interval=0)
+            dates = schedule.free_dates(start_date.date() - timedelta(days=1), len(phrases))
             added_count = 0
-            for i, phrase in enumerate(phrases):
-                date = start_date + timedelta(days=i)
-                date_str = date.strftime('%Y-%m-%d')
-                
-                if generator.add_phrase_to_file(phrase, date_str):
+            entries = [(day.strftime('%Y-%m-%d'), phrase) for day, phrase in zip(dates, phrases)]
+            written = set(generator.add_phrases_to_file(entries))
+            
+            for date_str, phrase in entries:
+                if (date_str, phrase) in written:
                     print(f"Added: {date_str}, {phrase}")
                     added_count += 1
                 else:
@@ -120,8 +151,11 @@ Examples:
         else:
             # Add with current date
             added_count = 0
+            written = {phrase for _, phrase in generator.add_phrases_to_file(
+                [(None, phrase) for phrase in phrases])}
+            
             for phrase in phrases:
-                if generator.add_phrase_to_file(phrase):
+                if phrase in written:
                     print(f"Added: {phrase}")
                     added_count += 1
                 else:
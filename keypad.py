@@ -0,0 +1,92 @@
+"""
+Keypad Encoder
+Shared phone-keypad encoding for the web app, the phrase generator and tooling.
+"""
+
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # Optional: encode_many() falls back to bytes.translate
+    np = None
+
+KEYPAD = {
+    'a': '2', 'b': '2', 'c': '2',
+    'd': '3', 'e': '3', 'f': '3',
+    'g': '4', 'h': '4', 'i': '4',
+    'j': '5', 'k': '5', 'l': '5',
+    'm': '6', 'n': '6', 'o': '6',
+    'p': '7', 'q': '7', 'r': '7', 's': '7',
+    't': '8', 'u': '8', 'v': '8',
+    'w': '9', 'x': '9', 'y': '9', 'z': '9',
+    ' ': '0'  # Spaces are represented as 0
+}
+
+# Letters on each digit key, in keypad order
+DIGIT_LETTERS = {}
+for _letter, _digit in KEYPAD.items():
+    if _letter != ' ':
+        DIGIT_LETTERS[_digit] = DIGIT_LETTERS.get(_digit, '') + _letter
+
+UNKNOWN = '-'
+SEPARATOR = '\n'
+
+# Inputs at least this many characters long take the NumPy path when available
+NUMPY_THRESHOLD = 1_000_000
+
+
+def _build_table(keep_separator=False):
+    table = bytearray(UNKNOWN.encode('ascii') * 256)
+    for char, digit in KEYPAD.items():
+        table[ord(char)] = ord(digit)
+        table[ord(char.upper())] = ord(digit)
+    if keep_separator:
+        # Keeps batch-encoded phrases separable after a single translate() call
+        table[ord(SEPARATOR)] = ord(SEPARATOR)
+    return bytes(table)
+
+
+# 256-entry byte translation table; every non-keypad byte maps to '-'
+TRANSLATION_TABLE = _build_table()
+_BATCH_TABLE = _build_table(keep_separator=True)
+
+
+def _to_ascii(text: str) -> bytes:
+    # Non-ASCII characters become a single '?' each, which maps to '-'
+    return text.encode('ascii', 'replace')
+
+
+def encode(phrase: str) -> str:
+    """Convert a word or phrase into its keypad digit code."""
+    return _to_ascii(phrase).translate(TRANSLATION_TABLE).decode('ascii')
+
+
+def encode_many(phrases: Iterable[str], use_numpy=None) -> List[str]:
+    """Encode a whole list of phrases in one call.
+
+    The phrases are joined and translated as a single buffer, so the cost is
+    one C-level pass regardless of how many phrases there are. ``use_numpy``
+    forces (True) or disables (False) the vectorized NumPy path; by default it
+    is used for very large inputs when NumPy is installed.
+    """
+    phrases = list(phrases)
+    if not phrases:
+        return []
+
+    buffer = _to_ascii(SEPARATOR.join(p.replace(SEPARATOR, '?') for p in phrases))
+    if use_numpy is None:
+        use_numpy = np is not None and len(buffer) >= NUMPY_THRESHOLD
+    elif use_numpy and np is None:
+        raise ImportError("numpy is required for use_numpy=True")
+
+    if use_numpy:
+        lookup = np.frombuffer(_BATCH_TABLE, dtype=np.uint8)
+        encoded = lookup[np.frombuffer(buffer, dtype=np.uint8)].tobytes()
+    else:
+        encoded = buffer.translate(_BATCH_TABLE)
+    return encoded.decode('ascii').split(SEPARATOR)
+
+
+def is_encodable(phrase: str) -> bool:
+    """Return True if every character of ``phrase`` maps to a keypad digit."""
+    return UNKNOWN not in encode(phrase)
@@ -0,0 +1,250 @@
+"""
+Metrics
+Low-overhead request and phase instrumentation exposed as Prometheus text at
+/metrics.
+
+Each process keeps its own counters and histograms in memory and overwrites
+METRICS_DIR/metrics-<pid>.json with them at most once per FLUSH_INTERVAL
+seconds. /metrics sums the files of every live process, so the numbers cover
+all gunicorn workers whichever one answers the scrape; files of processes
+that have exited are deleted when aggregating, so totals restart with the
+workers, which Prometheus treats as a counter reset. METRICS_DIR defaults to
+a directory named after this checkout, so separate deployments never mix.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+_DEPLOY_ID = hashlib.sha256(os.path.dirname(os.path.abspath(__file__)).encode()).hexdigest()[:12]
+METRICS_DIR = os.environ.get('METRICS_DIR',
+                             os.path.join(tempfile.gettempdir(), f"dialin-metrics-{_DEPLOY_ID}"))
+FLUSH_INTERVAL = 1.0
+
+# Upper bounds in seconds; requests here are expected to be sub-millisecond
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HELP = {
+    'dialin_http_requests_total': ('counter', 'HTTP requests by route, method and status.'),
+    'dialin_http_request_duration_seconds': ('histogram', 'HTTP request latency by route.'),
+    'dialin_phase_duration_seconds': ('histogram', 'Time spent in internal phases.'),
+}
+
+
+class Registry:
+    """In-process counters and fixed-bucket histograms."""
+
+    def __init__(self, directory=METRICS_DIR):
+        self.directory = directory
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._next_flush = 0.0
+        self._pending_flush = None
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value, buckets=DEFAULT_BUCKETS):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': list(buckets),
+                    'counts': [0] * (len(buckets) + 1),  # Last slot is +Inf
+                    'sum': 0.0,
+                }
+            counts = histogram['counts']
+            for i, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            histogram['sum'] += value
+
+    @contextmanager
+    def timed(self, phase):
+        """Record the duration of the enclosed block as an internal phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(phase, time.perf_counter() - start)
+
+    def observe_phase(self, phase, seconds):
+        """Record ``seconds`` spent in an internal phase."""
+        self.observe('dialin_phase_duration_seconds', {'phase': phase}, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, dict(labels), value]
+                             for (name, labels), value in self._counters.items()],
+                'histograms': [[name, dict(labels), h['buckets'], list(h['counts']), h['sum']]
+                               for (name, labels), h in self._histograms.items()],
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot for other workers to aggregate."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now < self._next_flush:
+                # Make sure the last requests before a quiet spell still get written
+                if self._pending_flush is None:
+                    self._pending_flush = threading.Timer(self._next_flush - now, self._flush_pending)
+                    self._pending_flush.daemon = True
+                    self._pending_flush.start()
+                return
+            self._next_flush = now + FLUSH_INTERVAL
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        # One writer at a time, so an older snapshot never replaces a newer one
+        with self._write_lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, 'w') as file:
+                    json.dump(self.snapshot(), file)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # Metrics must never fail a request; retry on the next flush
+
+    def _flush_pending(self):
+        with self._lock:
+            self._pending_flush = None
+        self.flush(force=True)
+
+    def collect(self):
+        """Merge the snapshots of every process into one."""
+        self.flush(force=True)
+        counters = {}
+        histograms = {}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            path = os.path.join(self.directory, name)
+            if not _is_running(name[len('metrics-'):-len('.json')]):
+                try:
+                    os.remove(path)  # Left by a worker that has exited
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path, 'r') as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue  # Mid-replace; pick it up next scrape
+            for metric, labels, value in data['counters']:
+                key = (metric, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0) + value
+            for metric, labels, buckets, counts, total in data['histograms']:
+                key = (metric, tuple(sorted(labels.items())), tuple(buckets))
+                merged = histograms.setdefault(key, [[0] * len(counts), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+        return counters, histograms
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        counters, histograms = self.collect()
+        lines = []
+        described = set()
+
+        def describe(metric):
+            if metric not in described:
+                described.add(metric)
+                kind, text = HELP.get(metric, ('untyped', metric))
+                lines.append(f"# HELP {metric} {text}")
+                lines.append(f"# TYPE {metric} {kind}")
+
+        for (metric, labels), value in sorted(counters.items()):
+            describe(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        for (metric, labels, buckets), (counts, total) in sorted(histograms.items()):
+            describe(metric)
+            cumulative = 0
+            for bound, count in zip(buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {cumulative}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _is_running(pid):
+    """True if ``pid`` (a string from a file name) is a live process."""
+    try:
+        os.kill(int(pid), 0)
+    except ValueError:
+        return True  # Not ours to judge; leave the file alone
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # Alive but owned by someone else
+    return True
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        k + '="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for k, v in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+registry = Registry()
+timed = registry.timed
+observe_phase = registry.observe_phase
+
+
+def init_app(app, registry=registry):
+    """Instrument every request of ``app`` and serve /metrics."""
+
+    @app.before_request
+    def start_timer():
+        g._metrics_start = time.perf_counter()
+
+    def record(status):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            registry.inc('dialin_http_requests_total', {
+                'route': route, 'method': request.method, 'status': str(status)
+            })
+            registry.observe('dialin_http_request_duration_seconds', {'route': route},
+                             time.perf_counter() - start)
+            registry.flush()
+
+    @app.after_request
+    def record_request(response):
+        record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def record_exception(exc):
+        # after_request is skipped when an exception propagates out of the app
+        if exc is not None:
+            record(500)
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
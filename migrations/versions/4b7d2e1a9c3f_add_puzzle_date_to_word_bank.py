@@ -0,0 +1,26 @@
+"""Add puzzle_date to word_bank
+
+Revision ID: 4b7d2e1a9c3f
+Revises: 9e5c6f16bece
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7d2e1a9c3f'
+down_revision = '9e5c6f16bece'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word_bank', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('puzzle_date', sa.Date(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('word_bank', schema=None) as batch_op:
+        batch_op.drop_column('puzzle_date')
@@ -0,0 +1,28 @@
+"""Index word_bank puzzle_date and word
+
+Revision ID: c81f5a6d2b07
+Revises: 4b7d2e1a9c3f
+Create Date: 2026-10-18 11:02:09.774512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5a6d2b07'
+down_revision = '4b7d2e1a9c3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word_bank', schema=None) as batch_op:
+        batch_op.create_index('ix_word_bank_puzzle_date', ['puzzle_date'], unique=True)
+        batch_op.create_index('ix_word_bank_word', ['word'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('word_bank', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_bank_word')
+        batch_op.drop_index('ix_word_bank_puzzle_date')
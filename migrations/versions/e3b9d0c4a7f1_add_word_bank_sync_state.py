@@ -0,0 +1,30 @@
+"""Add word_bank_sync to track incremental imports
+
+Revision ID: e3b9d0c4a7f1
+Revises: c81f5a6d2b07
+Create Date: 2026-10-18 18:20:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b9d0c4a7f1'
+down_revision = 'c81f5a6d2b07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('word_bank_sync',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+    sa.Column('inode', sa.BigInteger(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=16), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('word_bank_sync')
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Phrase Index
+Persistent set of every phrase already used in words.txt, so the generator,
+the scheduler and the CLI can check for duplicates without re-parsing the
+whole history each time they start.
+
+The index is an open-addressing hash table in a memory-mapped file next to
+words.txt. It remembers how far into words.txt it has read, the file's
+inode and a fingerprint of the bytes just before that point, so opening it
+only reads lines appended since the last update; a truncated, replaced or
+rewritten words.txt triggers a full rebuild.
+
+Layout (little-endian):
+  header  magic(8) version(H) slot_width(H) capacity(I) count(I)
+          bloom_bytes(I) source_offset(Q) source_inode(Q)
+          source_fingerprint(8): hash of the FINGERPRINT_SIZE bytes
+          before source_offset
+  slots   capacity * slot_width bytes; a phrase padded with zero bytes,
+          or all zero bytes if the slot is empty
+  bloom   bloom_bytes bytes of Bloom filter bits (optional), checked before
+          the table so misses rarely touch the slots
+
+Writers take an exclusive lock on <index>.lock; readers do not lock, and
+check at most once every check_interval seconds whether another process has
+replaced the index file.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+
+from word_schedule import iter_entries
+
+MAGIC = b'DIALIDX\x00'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sHHIIIQQ8s')
+COUNT = struct.Struct('<I')
+COUNT_OFFSET = 16  # Byte offset of the count field in HEADER
+SOURCE = struct.Struct('<QQ8s')
+SOURCE_OFFSET = 24  # Byte offset of source_offset in HEADER
+# Bytes before source_offset that must be unchanged to read on from there
+FINGERPRINT_SIZE = 64
+
+MIN_SLOT_WIDTH = 16
+MIN_CAPACITY = 1024
+BLOOM_HASHES = 5
+
+
+def default_index_path(words_file):
+    """words.txt -> words.idx"""
+    return os.path.splitext(words_file)[0] + '.idx'
+
+
+def _hash(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def _fingerprint(data):
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _slot_width_for(length):
+    return max(MIN_SLOT_WIDTH, (length + 7) // 8 * 8)
+
+
+def _capacity_for(count):
+    capacity = MIN_CAPACITY
+    while capacity < count * 2:  # Keep the load factor at or below 0.5
+        capacity *= 2
+    return capacity
+
+
+def _parse_phrases(data):
+    """Yield lowercased phrases from raw words.txt lines."""
+    for line in iter_entries(data.decode('utf-8')):
+        date_str, sep, phrase = line.strip().partition(', ')
+        if sep and phrase:
+            yield phrase.lower()
+
+
+class PhraseIndex:
+    """Disk-backed set of used phrases, kept in step with ``words_file``.
+
+    Supports ``in``, ``add``, ``len`` and iteration like the plain set it
+    replaces. Phrases are stored as given; callers lowercase them first.
+    Lookups stat the index file at most once every ``check_interval``
+    seconds to notice a copy rebuilt by another process; updates always
+    check, under the writers' lock.
+    """
+
+    def __init__(self, words_file='words.txt', path=None, bloom=False, check_interval=5.0):
+        self.words_file = words_file
+        self.path = path or default_index_path(words_file)
+        self.bloom = bloom
+        self.check_interval = check_interval
+        self._next_check = 0.0
+        self.bloom_bytes = 0
+        self._map = None
+        self._inode = None
+        self._lock_file = open(f"{self.path}.lock", 'a')
+        self.refresh()
+
+    # -- file management ---------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            self._sync_map()
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _map_is_current(self):
+        try:
+            return os.stat(self.path).st_ino == self._inode
+        except FileNotFoundError:
+            return False
+
+    def _sync_map(self):
+        """Remap if another process replaced the index file since we opened it."""
+        if self._map_is_current():
+            return
+        self._unmap()
+        if not self._map_file():
+            self._rebuild()
+
+    def _map_file(self):
+        """Map the index file. Returns False if it is missing or unusable."""
+        try:
+            with open(self.path, 'r+b') as file:
+                st = os.fstat(file.fileno())
+                if st.st_size < HEADER.size:
+                    return False
+                index_map = mmap.mmap(file.fileno(), 0)
+        except (FileNotFoundError, ValueError):
+            return False
+        (magic, version, slot_width, capacity, _, bloom_bytes,
+         _, _, _) = HEADER.unpack_from(index_map, 0)
+        if (magic != MAGIC or version != FORMAT_VERSION or
+                st.st_size != HEADER.size + capacity * slot_width + bloom_bytes):
+            index_map.close()
+            return False
+        self._map = index_map
+        self._inode = st.st_ino
+        self.slot_width = slot_width
+        self.capacity = capacity
+        self.bloom_bytes = bloom_bytes
+        self._bloom_start = HEADER.size + capacity * slot_width
+        return True
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._inode = None
+
+    def _write_index(self, phrases, source, slot_width=None):
+        """Write a fresh index holding ``phrases`` and swap it in atomically."""
+        phrases = list(dict.fromkeys(p.encode('utf-8') for p in phrases))
+        longest = max((len(p) for p in phrases), default=0)
+        slot_width = max(slot_width or 0, _slot_width_for(longest))
+        capacity = _capacity_for(len(phrases))
+        bloom_bytes = capacity if self.bloom or self.bloom_bytes else 0
+
+        body = bytearray(capacity * slot_width + bloom_bytes)
+        mask = capacity - 1
+        bloom_start = capacity * slot_width
+        for data in phrases:
+            digest = _hash(data)
+            slot = digest & mask
+            while body[slot * slot_width]:
+                slot = (slot + 1) & mask
+            body[slot * slot_width:slot * slot_width + len(data)] = data
+            for bit in self._bloom_bits(digest, bloom_bytes):
+                body[bloom_start + (bit >> 3)] |= 1 << (bit & 7)
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, slot_width, capacity, len(phrases),
+                             bloom_bytes, *source)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(header)
+            file.write(body)
+        os.replace(tmp_path, self.path)
+        self._unmap()
+        self._map_file()
+
+    def _rebuild(self):
+        """Index all of words_file from scratch."""
+        try:
+            with open(self.words_file, 'rb') as file:
+                inode = os.fstat(file.fileno()).st_ino
+                data = file.read()
+        except FileNotFoundError:
+            inode, data = 0, b''
+        # A line after the last newline may still be mid-write; it is indexed
+        # only if complete, and read again next time either way
+        offset = data.rfind(b'\n') + 1
+        fingerprint = _fingerprint(data[max(offset - FINGERPRINT_SIZE, 0):offset])
+        self._write_index(_parse_phrases(data), (offset, inode, fingerprint))
+
+    def _grow(self, slot_width=None):
+        self._write_index(list(self), SOURCE.unpack_from(self._map, SOURCE_OFFSET), slot_width)
+
+    # -- updates -------------------------------------------------------------
+
+    def refresh(self):
+        """Pick up lines appended to words_file. Returns the newly added phrases."""
+        with self._locked():
+            source_offset, source_inode, fingerprint = SOURCE.unpack_from(self._map, SOURCE_OFFSET)
+            try:
+                file = open(self.words_file, 'rb')
+            except FileNotFoundError:
+                return []
+            with file:
+                st = os.fstat(file.fileno())
+                tail = b''
+                if st.st_ino == source_inode and st.st_size >= source_offset:
+                    check_from = max(source_offset - FINGERPRINT_SIZE, 0)
+                    file.seek(check_from)
+                    tail = file.read(source_offset - check_from)
+                if (st.st_ino != source_inode or st.st_size < source_offset
+                        or _fingerprint(tail) != fingerprint):
+                    # Replaced, truncated, or rewritten before the point we had read to
+                    before = set(self)
+                    self._rebuild()
+                    return [phrase for phrase in self if phrase not in before]
+                if st.st_size == source_offset:
+                    return []
+                data = file.read()
+
+            added = [phrase for phrase in _parse_phrases(data) if self._add(phrase)]
+            consumed = data.rfind(b'\n') + 1
+            if consumed:
+                tail = (tail + data[:consumed])[-FINGERPRINT_SIZE:]
+                SOURCE.pack_into(self._map, SOURCE_OFFSET, source_offset + consumed,
+                                 source_inode, _fingerprint(tail))
+            return added
+
+    def rebuild(self):
+        """Discard the index and read all of words_file again."""
+        with self._locked():
+            self._rebuild()
+
+    def add(self, phrase):
+        """Add ``phrase``. Returns True if it was not already present."""
+        with self._locked():
+            return self._add(phrase)
+
+    def update(self, phrases):
+        """Add several phrases under one lock. Returns those that were new."""
+        with self._locked():
+            return [phrase for phrase in phrases if self._add(phrase)]
+
+    def _add(self, phrase):
+        data = phrase.encode('utf-8')
+        if not data:
+            return False
+        if len(data) > self.slot_width:
+            self._grow(_slot_width_for(len(data)))
+        digest = _hash(data)
+        slot = self._probe(data, digest)
+        if slot is None:
+            return False
+        count = COUNT.unpack_from(self._map, COUNT_OFFSET)[0]
+        if (count + 1) * 2 > self.capacity:
+            self._grow()
+            slot = self._probe(data, digest)
+        start = HEADER.size + slot * self.slot_width
+        self._map[start:start + len(data)] = data
+        for bit in self._bloom_bits(digest, self.bloom_bytes):
+            position = self._bloom_start + (bit >> 3)
+            self._map[position] |= 1 << (bit & 7)
+        COUNT.pack_into(self._map, COUNT_OFFSET, count + 1)
+        return True
+
+    # -- lookups -------------------------------------------------------------
+
+    @staticmethod
+    def _bloom_bits(digest, bloom_bytes):
+        if not bloom_bytes:
+            return ()
+        bits = bloom_bytes * 8
+        low, high = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        return [(low + i * high) % bits for i in range(BLOOM_HASHES)]
+
+    def _probe(self, data, digest):
+        """Return the empty slot where ``data`` would go, or None if present."""
+        padded = data.ljust(self.slot_width, b'\x00')
+        mask = self.capacity - 1
+        slot = digest & mask
+        while True:
+            start = HEADER.size + slot * self.slot_width
+            record = self._map[start:start + self.slot_width]
+            if record == padded:
+                return None
+            if not record[0]:
+                return slot
+            slot = (slot + 1) & mask
+
+    def __contains__(self, phrase):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            if not self._map_is_current():
+                with self._locked():  # Remaps, or rebuilds a deleted index, under the writers' lock
+                    pass
+        data = phrase.encode('utf-8')
+        if not data or len(data) > self.slot_width:
+            return False
+        digest = _hash(data)
+        for bit in self._bloom_bits(digest, self.bloom_bytes):
+            if not self._map[self._bloom_start + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return self._probe(data, digest) is None
+
+    def __len__(self):
+        return COUNT.unpack_from(self._map, COUNT_OFFSET)[0]
+
+    def __iter__(self):
+        width = self.slot_width
+        end = HEADER.size + self.capacity * width
+        for start in range(HEADER.size, end, width):
+            if self._map[start]:
+                yield self._map[start:start + width].rstrip(b'\x00').decode('utf-8')
+
+    def close(self):
+        self._unmap()
+        self._lock_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Build or query the persistent index of used phrases",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 phrase_index.py update                  # Index lines appended to words.txt
+  python3 phrase_index.py rebuild --bloom         # Re-index everything, with a Bloom filter
+  python3 phrase_index.py check "hello world"     # Is this phrase already used?
+        """
+    )
+    parser.add_argument('command', choices=['update', 'rebuild', 'check'])
+    parser.add_argument('phrase', nargs='?', help='Phrase to look up (for check)')
+    parser.add_argument(
+        '--words-file',
+        type=str,
+        default='words.txt',
+        help='Path to words file (default: words.txt)'
+    )
+    parser.add_argument('--index', type=str, help='Index path (default: next to the words file)')
+    parser.add_argument('--bloom', action='store_true',
+                        help='Add a Bloom filter in front of the table when rebuilding')
+    args = parser.parse_args()
+
+    with PhraseIndex(args.words_file, args.index, bloom=args.bloom) as index:
+        if args.command == 'update':
+            print(f"{len(index)} phrases indexed in {index.path}")
+        elif args.command == 'rebuild':
+            index.rebuild()
+            print(f"Rebuilt {index.path} with {len(index)} phrases")
+        else:
+            if args.phrase is None:
+                parser.error("check needs a phrase")
+            used = args.phrase.lower() in index
+            print(f"'{args.phrase}' {'is already used' if used else 'is not used'}")
+
+
+if __name__ == "__main__":
+    main()
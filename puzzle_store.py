@@ -0,0 +1,272 @@
+"""
+Puzzle Store
+Backends that answer "which phrase is scheduled for this day?" for the web app.
+
+PUZZLE_STORE=file (default) reads the compiled words.bin next to words.txt,
+or words.txt itself through ScheduleIndex while words.bin is missing or stale.
+PUZZLE_STORE=db reads the word_bank table named by DATABASE_URL, either a
+PostgreSQL DSN or sqlite:///path for an offline stand-in.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from compiled_schedule import DEFAULT_OUTPUT as COMPILED_FILE, CompiledSchedule
+from word_schedule import ScheduleIndex
+
+# How long a "nothing scheduled" answer is trusted before asking the DB again
+MISS_TTL_SECONDS = 60
+
+SQLITE_PREFIX = 'sqlite:///'
+
+
+class FilePuzzleStore:
+    """Puzzle store backed by words.txt, served from words.bin while it is current.
+
+    The compiled file is memory-mapped, so every worker shares its pages.
+    Whenever it is missing, unreadable or older than words.txt, an in-memory
+    ScheduleIndex answers instead, so edits go live before a recompile.
+    """
+
+    def __init__(self, words_file='words.txt', compiled_file=None, check_interval=5.0):
+        self.words_file = words_file
+        if compiled_file is None:
+            compiled_file = os.path.join(os.path.dirname(words_file), COMPILED_FILE)
+        self.compiled_file = compiled_file
+        self.check_interval = check_interval
+        self.index = None  # Built on the first fallback to words.txt
+        self._compiled = None
+        self._compiled_stat = None
+        self._active = None  # The CompiledSchedule in use, or None for the index
+        self._version = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    @property
+    def version(self):
+        return self._version
+
+    def _open_compiled(self):
+        """Return the mapped words.bin, reopening it if it was replaced."""
+        try:
+            st = os.stat(self.compiled_file)
+        except FileNotFoundError:
+            self._compiled = self._compiled_stat = None
+            return None
+        stat = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stat != self._compiled_stat:
+            # The old map is left to the garbage collector; a reader may still hold it
+            try:
+                self._compiled = CompiledSchedule(self.compiled_file)
+            except (OSError, ValueError):
+                self._compiled = None
+            self._compiled_stat = stat
+        return self._compiled
+
+    def refresh(self, force=False):
+        """Pick the source to serve from. Returns True if the schedule may have changed."""
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+
+        with self._lock:
+            self._next_check = now + self.check_interval
+            compiled = self._open_compiled()
+            if compiled is not None and not compiled.is_stale(self.words_file):
+                version = ('compiled',) + self._compiled_stat
+            else:
+                compiled = None
+                if self.index is None:
+                    self.index = ScheduleIndex(self.words_file, self.check_interval)
+                self.index.refresh()
+                version = ('text', self.index.version)
+            self._active = compiled
+            changed = version != self._version
+            self._version = version
+            return changed
+
+    def phrase_for(self, day):
+        self.refresh()
+        compiled = self._active
+        if compiled is None:
+            return self.index.phrase_for(day)
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return compiled.phrase_for_date(day)
+
+
+class ConnectionPool:
+    """Fixed-size pool of DB-API connections, private to one process.
+
+    Connections are opened lazily up to ``size``; callers beyond that block
+    until one is returned. After a fork (gunicorn preloading) the child drops
+    the inherited connections and starts its own pool.
+    """
+
+    def __init__(self, connect, size=2, timeout=10.0):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    conn = None
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        self._opened -= 1
+                        raise
+            if conn is None:
+                conn = self._idle.get(timeout=self.timeout)
+
+        try:
+            yield conn
+        except Exception:
+            # Don't hand a connection in an unknown state to the next caller
+            with self._lock:
+                self._opened -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        else:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+
+def connect_factory(database_url):
+    """Return (connect, paramstyle) for a PostgreSQL DSN or a sqlite:/// URL."""
+    if database_url.startswith(SQLITE_PREFIX):
+        path = database_url[len(SQLITE_PREFIX):]
+        return (lambda: sqlite3.connect(path, check_same_thread=False)), sqlite3.paramstyle
+
+    import psycopg2
+    return (lambda: psycopg2.connect(database_url)), psycopg2.paramstyle
+
+
+def placeholder(paramstyle):
+    """Return the positional placeholder for a DB-API paramstyle."""
+    return '?' if paramstyle == 'qmark' else '%s'
+
+
+class DatabasePuzzleStore:
+    """Puzzle store backed by the word_bank table.
+
+    Answers are cached per day, so each worker issues roughly one query per
+    day. Days with nothing scheduled are re-checked after MISS_TTL_SECONDS.
+    """
+
+    def __init__(self, connect, paramstyle='pyformat', pool_size=2):
+        self.pool = ConnectionPool(connect, size=pool_size)
+        self._query = (
+            "SELECT word FROM word_bank WHERE puzzle_date = "
+            f"{placeholder(paramstyle)} ORDER BY id LIMIT 1"
+        )
+        self._cache = {}
+        self._version = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def refresh(self):
+        return False
+
+    def invalidate(self):
+        """Forget cached answers, e.g. after an import into word_bank."""
+        self._cache = {}
+        self._version += 1
+
+    def phrase_for(self, day):
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        cached = self._cache.get(day)
+        if cached is not None:
+            phrase, expires = cached
+            if expires is None or time.monotonic() < expires:
+                return phrase
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self._query, (day.isoformat(),))
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+            conn.rollback()  # End the read transaction; psycopg2 opens one implicitly
+
+        phrase = row[0] if row else None
+        expires = None if phrase is not None else time.monotonic() + MISS_TTL_SECONDS
+        # Only today's (and perhaps yesterday's) answers are ever needed
+        cache = {d: v for d, v in self._cache.items() if abs((d - day).days) <= 1}
+        cache[day] = (phrase, expires)
+        self._cache = cache
+        return phrase
+
+
+def create_sqlite_schema(conn):
+    """Create word_bank/word_today/word_bank_sync as the Alembic migrations leave them."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS word_bank (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word VARCHAR(50) NOT NULL,
+            puzzle_date DATE
+        );
+        CREATE TABLE IF NOT EXISTS word_today (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word VARCHAR(50) NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS word_bank_sync (
+            id INTEGER PRIMARY KEY,
+            byte_offset BIGINT NOT NULL,
+            inode BIGINT NOT NULL,
+            fingerprint VARCHAR(16) NOT NULL
+        );
+    """)
+    conn.commit()
+
+
+def from_env(words_file='words.txt', environ=os.environ):
+    """Build the store selected by PUZZLE_STORE (file or db)."""
+    backend = environ.get('PUZZLE_STORE', 'file').lower()
+    if backend == 'file':
+        return FilePuzzleStore(words_file)
+    if backend == 'db':
+        database_url = environ.get('DATABASE_URL')
+        if not database_url:
+            raise RuntimeError("PUZZLE_STORE=db requires DATABASE_URL")
+        connect, paramstyle = connect_factory(database_url)
+        pool_size = int(environ.get('PUZZLE_DB_POOL_SIZE', 2))
+        return DatabasePuzzleStore(connect, paramstyle, pool_size=pool_size)
+    raise RuntimeError(f"Unknown PUZZLE_STORE '{backend}' (expected 'file' or 'db')")
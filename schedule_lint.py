@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Schedule Lint
+Checks words.txt (or a compiled words.bin) in a single streaming pass and
+reports every problem found:
+
+  malformed       line is not 'YYYY-MM-DD, phrase'
+  length          phrase is not PHRASE_LENGTH characters
+  character       phrase has characters with no keypad digit (encode to '-')
+  duplicate-phrase  phrase was already scheduled on an earlier line
+  duplicate-date  date was already scheduled on an earlier line
+  out-of-order    date is earlier than the line before it
+  missing-date    no phrase between the first and last scheduled dates
+
+Lines are never held in memory. Seen phrases are kept as 64-bit
+fingerprints in an open-addressing table of flat arrays (12 bytes a slot,
+with the line each came from), and seen dates as one bit per day, so
+memory grows by a few dozen bytes per distinct phrase, not with the size
+of the file.
+"""
+
+import json
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Iterator, Optional
+
+import keypad
+from compiled_schedule import MAGIC as COMPILED_MAGIC, CompiledSchedule
+from word_schedule import PHRASE_LENGTH
+
+KINDS = ('malformed', 'length', 'character', 'duplicate-phrase', 'duplicate-date',
+         'out-of-order', 'missing-date')
+
+
+@dataclass(frozen=True)
+class Issue:
+    """One problem, at a 1-based line (game number for words.bin)."""
+    kind: str
+    line: Optional[int]
+    message: str
+    date: Optional[str] = None
+
+
+class FingerprintSet:
+    """Set of 64-bit phrase fingerprints, remembering where each was first seen."""
+
+    def __init__(self, capacity=1 << 16):
+        self._keys = array('Q', bytes(8 * capacity))
+        self._lines = array('I', bytes(4 * capacity))
+        self._count = 0
+
+    @staticmethod
+    def fingerprint(phrase):
+        # str hashes are 64-bit and stable within one process, which is all a pass needs
+        return hash(phrase) & 0xFFFFFFFFFFFFFFFF or 1  # 0 marks an empty slot
+
+    def _slot(self, key):
+        mask = len(self._keys) - 1
+        slot = key & mask
+        while self._keys[slot] and self._keys[slot] != key:
+            slot = (slot + 1) & mask
+        return slot
+
+    def add(self, phrase, line):
+        """Record ``phrase``. Returns the line it was first seen on, or None if new."""
+        key = self.fingerprint(phrase)
+        slot = self._slot(key)
+        if self._keys[slot]:
+            return self._lines[slot]
+        if (self._count + 1) * 2 > len(self._keys):
+            self._grow()
+            slot = self._slot(key)
+        self._keys[slot] = key
+        self._lines[slot] = min(line, 0xFFFFFFFF)
+        self._count += 1
+        return None
+
+    def _grow(self):
+        keys, lines = self._keys, self._lines
+        self._keys = array('Q', bytes(16 * len(keys)))
+        self._lines = array('I', bytes(8 * len(keys)))
+        for key, line in zip(keys, lines):
+            if key:
+                slot = self._slot(key)
+                self._keys[slot] = key
+                self._lines[slot] = line
+
+    def __len__(self):
+        return self._count
+
+
+class DateBitmap:
+    """One bit per day between the earliest and latest date added."""
+
+    def __init__(self):
+        self._bits = bytearray()
+        self._base = None  # Ordinal of bit 0, always a multiple of 8
+        self.first = self.last = None
+
+    def add(self, ordinal):
+        """Set the bit for ``ordinal``. Returns True if it was already set."""
+        if self._base is None:
+            self._base = ordinal - ordinal % 8
+        if ordinal < self._base:
+            extra = (self._base - ordinal + 7) // 8
+            self._bits[:0] = bytes(extra)
+            self._base -= extra * 8
+        offset = ordinal - self._base
+        if offset >> 3 >= len(self._bits):
+            self._bits.extend(bytes(max((offset >> 3) + 1 - len(self._bits), len(self._bits))))
+        byte, bit = offset >> 3, 1 << (offset & 7)
+        if self._bits[byte] & bit:
+            return True
+        self._bits[byte] |= bit
+        self.first = ordinal if self.first is None else min(self.first, ordinal)
+        self.last = ordinal if self.last is None else max(self.last, ordinal)
+        return False
+
+    def gaps(self):
+        """Yield (first, last) ordinals of each unset run between first and last."""
+        if self.first is None:
+            return
+        start = None
+        for ordinal in range(self.first, self.last + 1):
+            offset = ordinal - self._base
+            if self._bits[offset >> 3] & (1 << (offset & 7)):
+                if start is not None:
+                    yield start, ordinal - 1
+                    start = None
+            elif start is None:
+                start = ordinal
+
+
+class ScheduleLinter:
+    """Accumulates state for one pass; feed entries with check()."""
+
+    def __init__(self, check_order=True):
+        self.check_order = check_order
+        self.phrases = FingerprintSet()
+        self.dates = DateBitmap()
+        self._previous = None
+
+    def check(self, line_number, date_str, phrase) -> Iterator[Issue]:
+        if len(phrase) != PHRASE_LENGTH:
+            yield Issue('length', line_number,
+                        f"'{phrase}' is {len(phrase)} characters, expected {PHRASE_LENGTH}", date_str)
+        code = keypad.encode(phrase)
+        if keypad.UNKNOWN in code:
+            bad = ''.join(dict.fromkeys(c for c, d in zip(phrase, code) if d == keypad.UNKNOWN))
+            yield Issue('character', line_number, f"'{phrase}' has no keypad digit for {bad!r}", date_str)
+        first_line = self.phrases.add(phrase.lower(), line_number)
+        if first_line is not None:
+            yield Issue('duplicate-phrase', line_number,
+                        f"'{phrase}' already scheduled on line {first_line}", date_str)
+
+        try:
+            ordinal = date.fromisoformat(date_str).toordinal()
+        except ValueError:
+            yield Issue('malformed', line_number, f"bad date '{date_str}'", date_str)
+            return
+        if self.dates.add(ordinal):
+            yield Issue('duplicate-date', line_number, f"{date_str} is already scheduled", date_str)
+        if self.check_order and self._previous is not None and ordinal < self._previous:
+            yield Issue('out-of-order', line_number,
+                        f"{date_str} comes after {date.fromordinal(self._previous)}", date_str)
+        self._previous = ordinal
+
+    def finish(self) -> Iterator[Issue]:
+        for first, last in self.dates.gaps():
+            first_day, last_day = date.fromordinal(first), date.fromordinal(last)
+            span = f"{first_day}" if first == last else f"{first_day} to {last_day}"
+            yield Issue('missing-date', None, f"no phrase for {span}", first_day.isoformat())
+
+
+def lint_text(path) -> Iterator[Issue]:
+    """Lint a words.txt-style file line by line."""
+    linter = ScheduleLinter()
+    with open(path, 'rb') as file:
+        for line_number, raw in enumerate(file, 1):
+            line = raw.decode('utf-8', 'replace').strip()
+            if not line:
+                continue
+            date_str, sep, phrase = line.partition(', ')
+            if not sep:
+                yield Issue('malformed', line_number, "expected 'YYYY-MM-DD, phrase'")
+                continue
+            yield from linter.check(line_number, date_str, phrase)
+    yield from linter.finish()
+
+
+def lint_compiled(path) -> Iterator[Issue]:
+    """Lint a compiled schedule; slots are in date order, so only phrases and gaps can fail."""
+    linter = ScheduleLinter(check_order=False)
+    with CompiledSchedule(path) as schedule:
+        for day, phrase in schedule.items():
+            game_number = (day - schedule.start_date).days + 1
+            yield from linter.check(game_number, day.isoformat(), phrase)
+    yield from linter.finish()
+
+
+def lint(path) -> Iterator[Issue]:
+    """Lint ``path``, telling a compiled schedule from text by its magic bytes."""
+    with open(path, 'rb') as file:
+        compiled = file.read(len(COMPILED_MAGIC)) == COMPILED_MAGIC
+    return lint_compiled(path) if compiled else lint_text(path)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Check the phrase schedule for problems in one pass",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 schedule_lint.py                          # Lint words.txt
+  python3 schedule_lint.py words.bin                # Lint a compiled schedule
+  python3 schedule_lint.py --json > issues.jsonl    # One JSON object per issue, then a summary
+  python3 schedule_lint.py --ignore duplicate-date,missing-date   # Pre-deploy check
+        """
+    )
+    parser.add_argument('path', nargs='?', default='words.txt',
+                        help='words.txt or compiled words.bin (default: words.txt)')
+    parser.add_argument('--json', action='store_true', help='Print JSON Lines instead of text')
+    parser.add_argument('--ignore', type=str, default='',
+                        help=f"Comma-separated kinds not to report ({', '.join(KINDS)})")
+    args = parser.parse_args()
+
+    ignored = {kind for kind in args.ignore.split(',') if kind}
+    unknown = ignored - set(KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+
+    try:
+        issues = lint(args.path)
+        counts = dict.fromkeys(KINDS, 0)
+        for issue in issues:
+            if issue.kind in ignored:
+                continue
+            counts[issue.kind] += 1
+            if args.json:
+                print(json.dumps(asdict(issue)))
+            else:
+                where = f"{args.path}:{issue.line}" if issue.line else args.path
+                print(f"{where}: {issue.kind}: {issue.message}")
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    total = sum(counts.values())
+    if args.json:
+        print(json.dumps({'summary': counts, 'issues': total, 'path': args.path}))
+    else:
+        print(f"{total} issue(s) in {args.path}")
+    sys.exit(1 if total else 0)
+
+
+if __name__ == "__main__":
+    main()
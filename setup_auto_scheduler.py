@@ -89,20 +89,11 @@ def setup_linux():
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    try:
-        import schedule
-        print("✅ schedule library is installed")
-        return True
-    except ImportError:
-        print("❌ schedule library not found")
-        print("Installing schedule library...")
-        try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'schedule'], check=True)
-            print("✅ schedule library installed successfully")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install schedule library")
-            return False
+    if sys.version_info < (3, 9):
+        print("❌ Dialin needs Python 3.9 or newer (matching the pinned dependencies)")
+        return False
+    print("✅ Python version is supported")
+    return True
 
 def test_scheduler():
     """Test the scheduler to make sure it works"""
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Static Asset Pipeline
+Fingerprints, minifies and precompresses the files in static/ so they can be
+served with immutable one-year cache headers.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import logging
+import os
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip siblings are written without it
+    brotli = None
+
+STATIC_DIR = 'static'
+BUILD_SUBDIR = 'build'
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Text assets worth minifying/compressing; PNGs are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.js', '.css', '.svg', '.html', '.txt', '.json'}
+
+# Tokens after which a '/' starts a regex literal rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                   'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+
+def minify_js(source):
+    """Strip comments and indentation from JavaScript, keeping line breaks.
+
+    Line breaks are preserved so automatic semicolon insertion behaves exactly
+    as in the original file. Strings, template literals and regex literals are
+    copied through untouched, including any line breaks and indentation
+    inside them.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last_significant = ''
+    pending = ''          # Whitespace since the last token, emitted only between tokens
+    at_line_start = True
+
+    def emit(text):
+        nonlocal pending, at_line_start
+        if pending and not at_line_start:
+            out.append(pending)
+        pending = ''
+        out.append(text)
+        at_line_start = False
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if ch in '\'"`':
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == '\\' else 1
+            emit(source[i:j + 1])
+            i = j + 1
+            last_significant = ch
+        elif ch == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+        elif ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch == '/' and (last_significant in _REGEX_PRECEDERS or last_significant in _REGEX_KEYWORDS
+                            or last_significant == ''):
+            j = i + 1
+            in_class = False
+            while j < n and source[j] != '\n':
+                c = source[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if c == '[':
+                    in_class = True
+                elif c == ']':
+                    in_class = False
+                elif c == '/' and not in_class:
+                    break
+                j += 1
+            emit(source[i:j + 1])
+            i = j + 1
+            last_significant = '/'
+        elif ch == '\n':
+            # Trailing whitespace and blank lines are dropped
+            pending = ''
+            if not at_line_start:
+                out.append('\n')
+                at_line_start = True
+            i += 1
+        elif ch.isspace():
+            if not at_line_start:
+                pending += ch
+            i += 1
+        elif ch.isalnum() or ch in '_$':
+            # Whole words, so 'return /x/' is told apart from 'total / x'
+            j = i + 1
+            while j < n and (source[j].isalnum() or source[j] in '_$'):
+                j += 1
+            emit(source[i:j])
+            last_significant = source[i:j]
+            i = j
+        else:
+            emit(ch)
+            last_significant = ch
+            i += 1
+
+    if not at_line_start:
+        out.append('\n')
+    return ''.join(out) or '\n'
+
+
+# At-rules whose blocks hold whole rules rather than declarations
+_GROUPING_AT_RULES = {'media', 'supports', 'document', 'container', 'layer', 'scope'}
+
+
+def minify_css(source):
+    """Strip comments and collapse whitespace in a stylesheet.
+
+    Quoted strings are copied through untouched. Whitespace around ':' is
+    only removed inside declaration blocks, so descendant selectors such as
+    'a :hover' keep their meaning.
+    """
+    out = []
+    blocks = []           # For each open block: True if it holds declarations
+    prelude_start = 0     # Where in ``out`` the current selector or at-rule began
+    pending_space = False
+    i = 0
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch in '"\'':
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == '\\' else 1
+            if pending_space:
+                out.append(' ')
+            out.append(source[i:j + 1])
+            pending_space = False
+            i = j + 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch.isspace():
+            pending_space = bool(out) and out[-1] not in '{};,>:'
+            i += 1
+        elif ch in '{};,>' or (ch == ':' and blocks and blocks[-1]):
+            # Punctuation swallows the whitespace on both sides
+            pending_space = False
+            if ch == '}' and out and out[-1] == ';':
+                out.pop()
+            if ch == '{':
+                prelude = ''.join(out[prelude_start:]).strip()
+                at_rule = prelude[1:].split(' ', 1)[0].lower() if prelude.startswith('@') else None
+                blocks.append(at_rule not in _GROUPING_AT_RULES)
+            elif ch == '}' and blocks:
+                blocks.pop()
+            out.append(ch)
+            if ch in '{};':
+                prelude_start = len(out)
+            i += 1
+        else:
+            if pending_space:
+                out.append(' ')
+                pending_space = False
+            out.append(ch)
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {
+    '.js': minify_js,
+    '.css': minify_css,
+}
+
+
+def _write_if_changed(path, data):
+    """Atomically write ``data`` unless an identical file already exists."""
+    try:
+        with open(path, 'rb') as file:
+            if file.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_assets(static_dir=STATIC_DIR, compress=True):
+    """Fingerprint every file in ``static_dir`` into ``static_dir/build``.
+
+    Returns the manifest mapping original filenames to fingerprinted ones.
+    Text assets are minified first, and compressible files get .gz (and .br
+    when the brotli package is installed) siblings.
+    """
+    build_dir = os.path.join(static_dir, BUILD_SUBDIR)
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')
+                   and os.path.join(root, d) != build_dir]
+        for name in sorted(files):
+            if name.startswith('.'):
+                continue
+            source_path = os.path.join(root, name)
+            rel_path = os.path.relpath(source_path, static_dir).replace(os.sep, '/')
+            stem, ext = os.path.splitext(rel_path)
+
+            with open(source_path, 'rb') as file:
+                data = file.read()
+            minifier = MINIFIERS.get(ext.lower())
+            if minifier:
+                data = minifier(data.decode('utf-8')).encode('utf-8')
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            hashed_name = f"{stem}.{digest}{ext}"
+            hashed_path = os.path.join(build_dir, hashed_name)
+            os.makedirs(os.path.dirname(hashed_path), exist_ok=True)
+            _write_if_changed(hashed_path, data)
+
+            if compress and ext.lower() in COMPRESSIBLE_EXTENSIONS:
+                _write_if_changed(hashed_path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write_if_changed(hashed_path + '.br', brotli.compress(data))
+
+            manifest[rel_path] = hashed_name
+
+    manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    _write_if_changed(os.path.join(build_dir, MANIFEST_NAME), manifest_bytes)
+    return manifest
+
+
+def load_manifest(build_dir):
+    """Read the manifest written by build_assets, keeping entries whose file exists."""
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME), 'r') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {original: hashed for original, hashed in manifest.items()
+            if os.path.isfile(os.path.join(build_dir, hashed))}
+
+
+def init_app(app, build=False):
+    """Wire fingerprinted URLs and immutable serving of static/build into ``app``.
+
+    ``url_for('static', filename='script.js')`` resolves to the fingerprinted
+    build file once this is called. The build itself is a deploy step
+    (``python3 static_assets.py``); at runtime the manifest is only read, so
+    a read-only checkout works. Files missing from the manifest, or every
+    file if nothing was built, keep their plain, unminified URL. Pass
+    ``build=True`` to build on start-up instead (local development).
+    """
+    static_dir = app.static_folder
+    build_dir = os.path.join(static_dir, BUILD_SUBDIR)
+    if build:
+        manifest = build_assets(static_dir)
+    else:
+        manifest = load_manifest(build_dir)
+        if not manifest:
+            logging.getLogger(__name__).warning(
+                "No static asset build in %s; serving unminified files. "
+                "Run 'python3 static_assets.py' at deploy time.", build_dir)
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static':
+            hashed_name = manifest.get(values.get('filename'))
+            if hashed_name:
+                values['filename'] = f"{BUILD_SUBDIR}/{hashed_name}"
+
+    @app.route(f"{app.static_url_path}/{BUILD_SUBDIR}/<path:filename>")
+    def static_build(filename):
+        """Serve a fingerprinted asset, preferring a precompressed sibling."""
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding = None
+        served_name = filename
+        for candidate in ('br', 'gzip'):
+            suffix = '.br' if candidate == 'br' else '.gz'
+            if (request.accept_encodings[candidate] > 0
+                    and os.path.isfile(os.path.join(build_dir, filename + suffix))):
+                encoding = candidate
+                served_name = filename + suffix
+                break
+
+        response = send_from_directory(build_dir, served_name, mimetype=mimetype, max_age=31536000)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        response.vary.add('Accept-Encoding')
+        return response
+
+    app.extensions['static_manifest'] = manifest
+    return manifest
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fingerprint, minify and precompress static assets",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 static_assets.py                    # Build static/build/ and print the manifest
+  python3 static_assets.py --no-compress     # Skip .gz/.br siblings
+        """
+    )
+    parser.add_argument(
+        '--static-dir',
+        type=str,
+        default=STATIC_DIR,
+        help='Directory holding the source assets (default: static)'
+    )
+    parser.add_argument(
+        '--no-compress',
+        action='store_true',
+        help="Don't write precompressed .gz/.br siblings"
+    )
+    args = parser.parse_args()
+
+    manifest = build_assets(args.static_dir, compress=not args.no_compress)
+    for original, hashed in sorted(manifest.items()):
+        print(f"{original} -> {BUILD_SUBDIR}/{hashed}")
+    if brotli is None:
+        print("brotli not installed; wrote gzip siblings only")
+
+
+if __name__ == "__main__":
+    main()
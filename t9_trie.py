@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+T9 Trie
+Reverse keypad lookup: every dictionary phrase that produces a given digit
+code, with 0 separating words.
+
+The trie is built once from a word list and saved in a compact binary file
+that is opened with mmap, so the generator and the web app can query it
+without rebuilding it at import time.
+
+Layout (little-endian):
+  header  magic(8) version(H) node_count(I) blob_size(I) word_count(I)
+          source_size(Q) source_mtime_ns(Q)
+  nodes   node_count records of first_child(I) child_mask(B)
+          words_offset(I) words_size(H) words_count(H), in breadth-first
+          order so each node's children are consecutive; bit k of the mask
+          is set when the node has a child for digit k + 2
+  blob    words for each node, space separated, at words_offset
+"""
+
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from itertools import product
+
+import keypad
+
+MAGIC = b'DIALT9\x00\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHIIIQQ')
+NODE = struct.Struct('<IBIHH')
+
+DIGITS = '23456789'
+WORD_SEPARATOR = keypad.KEYPAD[' ']
+
+DEFAULT_WORD_LIST = '/usr/share/dict/words'
+DEFAULT_OUTPUT = 't9.trie'
+
+
+def load_words(path=DEFAULT_WORD_LIST):
+    """Read one word per line, keeping lowercase a-z words once each."""
+    words = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        for line in file:
+            word = line.strip().lower()
+            if word and word.isascii() and word.isalpha():
+                words[word] = None
+    return list(words)
+
+
+def build_trie(words, output=DEFAULT_OUTPUT, source=None):
+    """Build the trie for ``words`` and write it to ``output``.
+
+    ``source`` is the word list path, recorded so is_stale() can tell when to
+    rebuild. Returns the number of nodes written.
+    """
+    # In-memory trie: node = [children by digit, words]
+    root = [{}, []]
+    word_count = 0
+    for word in dict.fromkeys(words):
+        node = root
+        for digit in keypad.encode(word):
+            if digit not in DIGITS:
+                break
+            node = node[0].setdefault(digit, [{}, []])
+        else:
+            node[1].append(word)
+            word_count += 1
+
+    # Breadth-first numbering keeps every node's children in one run
+    order = [root]
+    first_child = []
+    for node in order:
+        first_child.append(len(order))
+        order.extend(node[0][digit] for digit in sorted(node[0]))
+
+    nodes = bytearray(len(order) * NODE.size)
+    blob = bytearray()
+    for index, (children, node_words) in enumerate(order):
+        mask = 0
+        for digit in children:
+            mask |= 1 << DIGITS.index(digit)
+        data = ' '.join(node_words).encode('ascii')
+        if len(data) > 0xFFFF:
+            raise ValueError(f"Too many words share the code {keypad.encode(node_words[0])}")
+        NODE.pack_into(nodes, index * NODE.size, first_child[index] if children else 0,
+                       mask, len(blob), len(data), len(node_words))
+        blob.extend(data)
+
+    source_size = source_mtime_ns = 0
+    if source:
+        st = os.stat(source)
+        source_size, source_mtime_ns = st.st_size, st.st_mtime_ns
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(order), len(blob), word_count,
+                         source_size, source_mtime_ns)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(nodes)
+        file.write(blob)
+    os.replace(tmp_path, output)
+    return len(order)
+
+
+class T9Trie:
+    """Read-only, memory-mapped view of a built trie."""
+
+    def __init__(self, path=DEFAULT_OUTPUT, cache_size=65536):
+        self.path = path
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: truncated header")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.node_count, blob_size, self.word_count,
+         self.source_size, self.source_mtime_ns) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: not a T9 trie (version {FORMAT_VERSION})")
+        self._blob_start = HEADER.size + self.node_count * NODE.size
+        if size != self._blob_start + blob_size:
+            self._map.close()
+            raise ValueError(f"{path}: size does not match header")
+        # Codes repeat a lot across a candidate pool; keep recent answers
+        self.words_for = lru_cache(maxsize=cache_size)(self._words_for)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _node_for(self, code):
+        """Return the node record reached by ``code``, or None."""
+        index = 0
+        for digit in code:
+            first_child, mask, _, _, _ = NODE.unpack_from(self._map, HEADER.size + index * NODE.size)
+            position = DIGITS.find(digit)
+            if position < 0 or not mask & (1 << position):
+                return None
+            index = first_child + bin(mask & ((1 << position) - 1)).count('1')
+        return NODE.unpack_from(self._map, HEADER.size + index * NODE.size)
+
+    def _words_for(self, code):
+        node = self._node_for(code)
+        if node is None or not node[4]:
+            return ()
+        start = self._blob_start + node[2]
+        return tuple(self._map[start:start + node[3]].decode('ascii').split(' '))
+
+    def word_count_for(self, code):
+        """Number of dictionary words whose code is exactly ``code``."""
+        node = self._node_for(code)
+        return node[4] if node else 0
+
+    def count_phrases(self, code):
+        """Number of phrases matching ``code`` without listing them."""
+        total = 1
+        for segment in code.split(WORD_SEPARATOR):
+            total *= self.word_count_for(segment) if segment else 0
+            if not total:
+                return 0
+        return total
+
+    def phrases_for(self, code, limit=None):
+        """Yield every dictionary phrase whose keypad code is ``code``."""
+        segments = code.split(WORD_SEPARATOR)
+        if not all(segments):
+            return  # Leading, trailing or doubled separators never match
+        choices = [self.words_for(segment) for segment in segments]
+        if not all(choices):
+            return
+        for count, words in enumerate(product(*choices)):
+            if limit is not None and count >= limit:
+                return
+            yield ' '.join(words)
+
+    def is_stale(self, word_list=DEFAULT_WORD_LIST):
+        """Return True if ``word_list`` changed since the trie was built."""
+        try:
+            st = os.stat(word_list)
+        except FileNotFoundError:
+            return True
+        return (st.st_size, st.st_mtime_ns) != (self.source_size, self.source_mtime_ns)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Build and query the reverse keypad (T9) trie",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 t9_trie.py build                              # From /usr/share/dict/words
+  python3 t9_trie.py build --word-list my_words.txt     # From another word list
+  python3 t9_trie.py solve 4355609673                   # Phrases for a code
+  python3 t9_trie.py solve "hello world" --limit 20     # Phrases sharing this phrase's code
+        """
+    )
+    parser.add_argument('command', choices=['build', 'solve'])
+    parser.add_argument('code', nargs='?', help='Digit code or phrase to solve')
+    parser.add_argument(
+        '--word-list',
+        type=str,
+        default=DEFAULT_WORD_LIST,
+        help=f'One word per line (default: {DEFAULT_WORD_LIST})'
+    )
+    parser.add_argument(
+        '--trie',
+        type=str,
+        default=DEFAULT_OUTPUT,
+        help=f'Path to the built trie (default: {DEFAULT_OUTPUT})'
+    )
+    parser.add_argument('--limit', type=int, default=50, help='Maximum phrases to print (default: 50)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        try:
+            words = load_words(args.word_list)
+        except FileNotFoundError:
+            print(f"Error: word list {args.word_list} not found; pass --word-list")
+            sys.exit(1)
+        nodes = build_trie(words, args.trie, source=args.word_list)
+        print(f"Built {args.trie}: {len(words)} words, {nodes} nodes")
+        return
+
+    if args.code is None:
+        parser.error("solve needs a code or phrase")
+    code = args.code if args.code.isdigit() else keypad.encode(args.code)
+    with T9Trie(args.trie) as trie:
+        total = trie.count_phrases(code)
+        print(f"{code}: {total} matching phrases")
+        for phrase in trie.phrases_for(code, limit=args.limit):
+            print(f"  {phrase}")
+        if total > args.limit:
+            print(f"  ... {total - args.limit} more")
+
+
+if __name__ == "__main__":
+    main()
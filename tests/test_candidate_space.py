@@ -0,0 +1,43 @@
+import random
+
+from candidate_space import CandidateEnumerator
+
+WORDS_BY_LENGTH = {
+    3: ('big', 'red', 'the'),
+    4: ('cool', 'over'),
+    5: ('after', 'house'),
+    6: ('cherry', 'beside'),
+}
+PAIRS = [(('big', 'red'), ('cherry',)), (('cool',), ('house',))]
+FIXED = ['cool house', 'good night']
+
+
+def make_enumerator(used=None):
+    return CandidateEnumerator(WORDS_BY_LENGTH, single_words=['basketball'],
+                               fixed_phrases=FIXED, pair_buckets=PAIRS, used=used)
+
+
+def test_spaces_are_disjoint_and_counted_exactly():
+    candidates = make_enumerator()
+    drawn = list(candidates.iter_unused(random.Random(3)))
+    assert len(drawn) == len(set(drawn)) == candidates.size
+    # 'cool house' is both a template and a pair; 'big cherry' is both a pair
+    # and a raw 3 + 6 composition. Each is drawn exactly once.
+    assert drawn.count('cool house') == 1
+    assert drawn.count('big cherry') == 1
+
+
+def test_raw_compositions_come_after_curated_phrases_and_pairs():
+    candidates = make_enumerator()
+    multi = [p for p in candidates.iter_unused(random.Random(7)) if p != 'basketball']
+    curated = [p for p in multi if p in candidates.fixed or p in candidates.pairs]
+    assert multi[:len(curated)] == curated
+    assert all(p in candidates.compositions for p in multi[len(curated):])
+
+
+def test_remaining_skips_used_phrases():
+    used = {'big cherry', 'the beside', 'good night'}
+    candidates = make_enumerator(used)
+    drawn = list(candidates.iter_unused(random.Random(1)))
+    assert not used & set(drawn)
+    assert candidates.remaining == len(drawn)
@@ -0,0 +1,43 @@
+import pytest
+
+from difficulty import DifficultyScorer
+from t9_trie import T9Trie, build_trie
+
+# 'good'/'home'/'gone'/'hood' share 4663; 'kiss'/'lips' share 5477
+WORDS = ['good', 'home', 'gone', 'hood', 'night', 'might', 'kiss', 'lips', 'happy', 'ended', 'glad']
+FREQUENCIES = {'good': 100000, 'home': 50000, 'night': 80000, 'might': 60000,
+               'kiss': 20000, 'lips': 15000, 'happy': 90000, 'ended': 40000, 'glad': 30000}
+
+
+@pytest.fixture
+def trie(tmp_path):
+    path = str(tmp_path / 't9.trie')
+    build_trie(WORDS, output=path)
+    trie = T9Trie(path)
+    yield trie
+    trie.close()
+
+
+def test_zero_collision_phrase_outranks_known_ambiguous_ones(trie):
+    scorer = DifficultyScorer(trie)
+    unknown = scorer.score('jazzy quip')  # No decodings: words the trie doesn't know
+    ranked = sorted(scorer.score_many(['glad ended', 'kiss happy', 'good night', 'jazzy quip']),
+                    key=lambda score: score.difficulty)
+    assert unknown.phrase_collisions == 0
+    assert [score.phrase for score in ranked] == ['glad ended', 'kiss happy', 'good night', 'jazzy quip']
+
+
+def test_zero_collision_phrases_are_ranked_by_branching(trie):
+    scorer = DifficultyScorer(trie)
+    plain = scorer.score('abcde fghi')  # 3-letter keys only
+    spiky = scorer.score('pqrsw xyzz')  # 4-letter keys only
+    assert plain.phrase_collisions == spiky.phrase_collisions == 0
+    assert spiky.difficulty > plain.difficulty > 0
+
+
+def test_frequencies_rank_rare_words_harder(trie):
+    scorer = DifficultyScorer(trie, FREQUENCIES)
+    common = scorer.score('glad ended')  # One decoding of common words
+    unknown = scorer.score('jazzy quip')
+    assert common.phrase_collisions == 1
+    assert unknown.difficulty > common.difficulty > 0
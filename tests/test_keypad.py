@@ -0,0 +1,31 @@
+import pytest
+
+import keypad
+
+
+def test_letters_map_to_their_digit_key():
+    assert keypad.encode('abcdefghijklmnopqrstuvwxyz') == '22233344455566677778889999'
+    assert keypad.encode('HELLO') == keypad.encode('hello') == '43556'
+
+
+def test_spaces_encode_as_zero():
+    assert keypad.encode('hello world') == '43556096753'
+
+
+@pytest.mark.parametrize('phrase', ['rock-n-roll', "don't stop", 'café crème', 'line\nbreak', 'tab\there'])
+def test_characters_off_the_keypad_are_rejected(phrase):
+    code = keypad.encode(phrase)
+    assert len(code) == len(phrase)
+    assert keypad.UNKNOWN in code
+    assert not keypad.is_encodable(phrase)
+
+
+def test_encode_many_matches_encode():
+    phrases = ['hello world', 'line\nbreak', '', 'café']
+    assert keypad.encode_many(phrases) == [keypad.encode(p) for p in phrases]
+
+
+def test_encode_many_numpy_path_matches_translate():
+    pytest.importorskip('numpy')
+    phrases = ['hello world', 'quiet date', 'ok!']
+    assert keypad.encode_many(phrases, use_numpy=True) == keypad.encode_many(phrases, use_numpy=False)
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import metrics
+
+
+def test_collect_sums_live_workers_and_prunes_exited_ones(tmp_path):
+    registry = metrics.Registry(str(tmp_path))
+    registry.inc('dialin_http_requests_total', {'status': '200'})
+    registry.flush(force=True)
+
+    child = subprocess.Popen([sys.executable, '-c', ''])
+    child.wait()  # Reaped, so its pid no longer names a process
+    exited = child.pid
+    stale = tmp_path / f"metrics-{exited}.json"
+    stale.write_text(json.dumps({'counters': [['dialin_http_requests_total', {'status': '200'}, 5]],
+                                 'histograms': []}))
+
+    counters, _ = registry.collect()
+    assert counters == {('dialin_http_requests_total', (('status', '200'),)): 1}
+    assert not stale.exists()
+    assert os.listdir(tmp_path) == [f"metrics-{os.getpid()}.json"]
+
+
+def test_concurrent_flushes_arm_one_timer(tmp_path, monkeypatch):
+    started = []
+    real_timer = threading.Timer
+
+    def counting_timer(*args, **kwargs):
+        timer = real_timer(*args, **kwargs)
+        started.append(timer)
+        return timer
+
+    monkeypatch.setattr(metrics.threading, 'Timer', counting_timer)
+    registry = metrics.Registry(str(tmp_path))
+    registry.flush()  # Writes and starts the FLUSH_INTERVAL window
+    threads = [threading.Thread(target=registry.flush) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(started) == 1
+    started[0].cancel()
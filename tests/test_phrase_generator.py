@@ -0,0 +1,100 @@
+import os
+import shutil
+
+import pytest
+
+import phrase_generator
+from phrase_generator import PhraseGenerator
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    # The generator reads and indexes words.txt in the working directory
+    shutil.copy(os.path.join(REPO_DIR, 'words.txt'), tmp_path / 'words.txt')
+    monkeypatch.chdir(tmp_path)
+    generator = PhraseGenerator()
+    yield generator
+    generator.existing_phrases.close()
+
+
+def test_generated_phrases_come_from_curated_spaces(generator):
+    candidates = generator.candidates
+    phrases = generator.generate_phrases(30, seed=1)
+    assert len(phrases) == 30
+    for phrase in phrases:
+        assert len(phrase) == 10
+        assert phrase not in candidates.compositions, f"fell back to raw composition '{phrase}'"
+        assert (phrase in candidates.single_tier or phrase in candidates.fixed
+                or phrase in candidates.pairs)
+
+
+def test_generated_phrases_are_unused_and_unique(generator):
+    phrases = generator.generate_phrases(50, seed=2)
+    assert len(set(phrases)) == len(phrases)
+    assert not any(phrase in generator.existing_phrases for phrase in phrases)
+
+
+def test_simple_pairs_remaining_tracks_added_phrases(generator):
+    before = generator.simple_pairs_remaining()
+    phrase = next(p for p in generator.generate_phrases(200, seed=3) if p in generator.simple_pairs)
+    assert generator.add_phrases_to_file([('2099-01-01', phrase)])
+    assert generator.simple_pairs_remaining() == before - 1
+
+
+def test_parallel_batch_does_not_depend_on_workers(generator, monkeypatch):
+    serial = generator.generate_phrases_parallel(100, workers=1, seed=4)
+    monkeypatch.setattr(phrase_generator, 'PARALLEL_THRESHOLD', 0)
+    monkeypatch.setattr(phrase_generator.os, 'cpu_count', lambda: 2)
+    assert PhraseGenerator._pool_size(100, workers=2) == 2
+    pooled = generator.generate_phrases_parallel(100, workers=2, seed=4)
+    assert len(serial) == 100
+    assert pooled == serial
+
+
+def test_parallel_batch_is_a_prefix_of_a_larger_one(generator):
+    small = generator.generate_phrases_parallel(40, workers=1, seed=5)
+    large = generator.generate_phrases_parallel(300, workers=1, seed=5)
+    assert len(large) == 300
+    assert large[:40] == small
+
+
+def test_recorded_template_is_never_drawn_again(generator, tmp_path, monkeypatch):
+    # Free the templates by leaving their lines out of a fresh words.txt
+    templates = {' '.join(t) for t in generator.phrase_templates if len(' '.join(t)) == 10}
+    with open(os.path.join(REPO_DIR, 'words.txt')) as source:
+        lines = [line for line in source if line.strip().partition(', ')[2].lower() not in templates]
+    (tmp_path / 'fresh').mkdir()
+    (tmp_path / 'fresh' / 'words.txt').write_text(''.join(lines))
+    monkeypatch.chdir(tmp_path / 'fresh')
+    fresh = PhraseGenerator()
+    try:
+        pool = fresh.template_pool
+        assert len(pool) == len(templates)
+        phrase = pool.pick()
+        assert fresh.add_phrases_to_file([('2099-01-01', phrase)])
+        assert phrase not in pool
+        assert len(pool) == len(templates) - 1
+        assert all(fresh._try_phrase_templates() != phrase for _ in range(200))
+    finally:
+        fresh.existing_phrases.close()
+
+
+def test_unused_pool_swap_removes():
+    from candidate_space import UnusedPool
+    pool = UnusedPool(['alpha beta', 'gamma delt', 'epsil zeta'], used={'gamma delt'})
+    assert len(pool) == 2 and 'gamma delt' not in pool
+    pool.discard('alpha beta')
+    assert len(pool) == 1
+    assert pool.pick() == 'epsil zeta'
+    pool.discard('epsil zeta')
+    assert pool.pick() is None
+
+
+def test_pool_is_skipped_for_small_batches_and_single_cores(monkeypatch):
+    monkeypatch.setattr(phrase_generator.os, 'cpu_count', lambda: 8)
+    assert PhraseGenerator._pool_size(phrase_generator.PARALLEL_THRESHOLD - 1, workers=8) == 1
+    assert PhraseGenerator._pool_size(phrase_generator.PARALLEL_THRESHOLD, workers=8) == 8
+    monkeypatch.setattr(phrase_generator.os, 'cpu_count', lambda: 1)
+    assert PhraseGenerator._pool_size(10 ** 6, workers=8) == 1
@@ -0,0 +1,46 @@
+from phrase_index import PhraseIndex
+
+
+def test_refresh_reads_only_appended_lines(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    with PhraseIndex(str(words)) as index:
+        with open(words, 'a') as file:
+            file.write("2025-04-18, second day\n")
+        assert index.refresh() == ['second day']
+        assert len(index) == 2
+
+
+def test_refresh_rebuilds_after_same_size_rewrite(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    with PhraseIndex(str(words)) as index:
+        # Rewrite in place: same inode, same size, different bytes
+        with open(words, 'r+b') as file:
+            file.write(b"2025-04-17, other game\n")
+        assert index.refresh() == ['other game']
+        assert 'other game' in index
+        assert 'first game' not in index
+
+
+def test_lookups_follow_an_index_replaced_by_another_process(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    with PhraseIndex(str(words), check_interval=0) as reader, PhraseIndex(str(words)) as writer:
+        with open(words, 'a') as file:
+            file.write("2025-04-18, second day\n")
+        writer.rebuild()
+        assert 'second day' in reader
+
+
+def test_lookups_check_for_a_replaced_index_once_per_interval(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    with PhraseIndex(str(words), check_interval=60) as reader, PhraseIndex(str(words)) as writer:
+        assert 'first game' in reader
+        with open(words, 'a') as file:
+            file.write("2025-04-18, second day\n")
+        writer.rebuild()
+        assert 'second day' not in reader  # Still on the old copy until the next check
+        reader.refresh()
+        assert 'second day' in reader
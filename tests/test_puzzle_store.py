@@ -0,0 +1,69 @@
+import os
+from datetime import date
+
+from compiled_schedule import CompiledSchedule, compile_schedule, verify_schedule
+from puzzle_store import FilePuzzleStore
+
+
+def write_schedule(path, entries):
+    with open(path, 'w') as file:
+        for day, phrase in entries:
+            file.write(f"{day}, {phrase}\n")
+
+
+def test_serves_compiled_schedule_while_current(tmp_path):
+    words = tmp_path / 'words.txt'
+    write_schedule(words, [('2025-04-17', 'first game'), ('2025-04-18', 'second day')])
+    compile_schedule(str(words), str(tmp_path / 'words.bin'))
+
+    store = FilePuzzleStore(str(words), check_interval=0)
+    assert store.version[0] == 'compiled'
+    assert store.index is None
+    assert store.phrase_for('2025-04-18') == 'second day'
+    assert store.phrase_for(date(2025, 4, 19)) is None
+
+
+def test_falls_back_to_words_txt_when_compiled_is_stale(tmp_path):
+    words = tmp_path / 'words.txt'
+    write_schedule(words, [('2025-04-17', 'first game')])
+    compile_schedule(str(words), str(tmp_path / 'words.bin'))
+    store = FilePuzzleStore(str(words), check_interval=0)
+
+    with open(words, 'a') as file:
+        file.write("2025-04-18, second day\n")
+    st = os.stat(words)
+    os.utime(words, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    assert store.phrase_for('2025-04-18') == 'second day'
+    assert store.version[0] == 'text'
+
+    compile_schedule(str(words), str(tmp_path / 'words.bin'))
+    assert store.refresh()
+    assert store.version[0] == 'compiled'
+    assert store.phrase_for('2025-04-18') == 'second day'
+
+
+def test_missing_compiled_schedule_reads_words_txt(tmp_path):
+    words = tmp_path / 'words.txt'
+    write_schedule(words, [('2025-04-17', 'first game')])
+
+    store = FilePuzzleStore(str(words), check_interval=0)
+    assert store.version[0] == 'text'
+    assert store.phrase_for('2025-04-17') == 'first game'
+
+
+def test_compile_skips_and_reports_bad_lines(tmp_path):
+    words = tmp_path / 'words.txt'
+    write_schedule(words, [('2025-04-16', 'too early!'), ('2025-04-17', 'first game'),
+                           ('2025-04-18', 'too long phrase'), ('2025-04-19', 'third game')])
+    with open(words, 'a') as file:
+        file.write("not a schedule line\n")
+    compiled = str(tmp_path / 'words.bin')
+
+    count, warnings = compile_schedule(str(words), compiled)
+    assert count == 3
+    assert [warning.split(':')[1] for warning in warnings] == ['1', '3', '5']
+    assert verify_schedule(str(words), compiled) == []
+    with CompiledSchedule(compiled) as schedule:
+        assert list(schedule.items()) == [(date(2025, 4, 17), 'first game'),
+                                          (date(2025, 4, 19), 'third game')]
@@ -0,0 +1,23 @@
+from static_assets import minify_js
+
+
+def test_regex_after_keywords_is_copied_through():
+    source = ("function quoted(s) {\n"
+              "    return /'/.test(s);  // a quote, not a string\n"
+              "}\n"
+              "switch (x) {\n"
+              "    case /[/]'/.source: break;\n"
+              "}\n"
+              "if (typeof /\"/ === 'object') { y = 1; }\n")
+    assert minify_js(source) == ("function quoted(s) {\n"
+                                 "return /'/.test(s);\n"
+                                 "}\n"
+                                 "switch (x) {\n"
+                                 "case /[/]'/.source: break;\n"
+                                 "}\n"
+                                 "if (typeof /\"/ === 'object') { y = 1; }\n")
+
+
+def test_slash_after_identifiers_and_numbers_is_division():
+    source = "var half = total / 2 / count; // 'half'\nvar r = returned / x[0] / 'y'.length;\n"
+    assert minify_js(source) == "var half = total / 2 / count;\nvar r = returned / x[0] / 'y'.length;\n"
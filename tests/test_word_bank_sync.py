@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from puzzle_store import create_sqlite_schema
+from word_bank_sync import CST, import_schedule
+
+
+def connect(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'dialin.db'))
+    create_sqlite_schema(conn)
+    return conn
+
+
+def word_today(conn):
+    return [row[0] for row in conn.execute("SELECT word FROM word_today")]
+
+
+def word_bank(conn):
+    return conn.execute("SELECT puzzle_date, word FROM word_bank ORDER BY puzzle_date").fetchall()
+
+
+def test_import_points_word_today_at_todays_phrase(tmp_path):
+    today = datetime.now(CST).date()
+    words = tmp_path / 'words.txt'
+    words.write_text(f"{today - timedelta(days=1)}, yesterdays\n{today}, todays one\n")
+    conn = connect(tmp_path)
+    assert import_schedule(conn, str(words)) == 2
+    assert word_today(conn) == ['todays one']
+
+
+def test_incremental_import_picks_up_gap_fills_dated_before_the_newest(tmp_path):
+    today = datetime.now(CST).date()
+    later = today + timedelta(days=2)
+    words = tmp_path / 'words.txt'
+    words.write_text(f"{later}, later game\n")
+    conn = connect(tmp_path)
+    import_schedule(conn, str(words))
+    assert word_today(conn) == []
+
+    with open(words, 'a') as file:
+        file.write(f"{today}, gap filler\n")
+    assert import_schedule(conn, str(words), incremental=True) == 1
+    assert word_today(conn) == ['gap filler']
+    assert word_bank(conn) == [(today.isoformat(), 'gap filler'), (later.isoformat(), 'later game')]
+
+
+def test_incremental_import_keeps_the_first_entry_for_a_date(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    conn = connect(tmp_path)
+    import_schedule(conn, str(words))
+
+    with open(words, 'a') as file:
+        file.write("2025-04-17, late repeat\n2025-04-18, second day\n")
+    assert import_schedule(conn, str(words), incremental=True) == 2
+    assert word_bank(conn) == [('2025-04-17', 'first game'), ('2025-04-18', 'second day')]
+
+
+def test_incremental_import_redoes_everything_after_a_rewrite(tmp_path):
+    words = tmp_path / 'words.txt'
+    words.write_text("2025-04-17, first game\n")
+    conn = connect(tmp_path)
+    import_schedule(conn, str(words))
+
+    # Same inode and size, different bytes before the stored offset
+    with open(words, 'r+b') as file:
+        file.write(b"2025-04-17, other game\n")
+    with open(words, 'a') as file:
+        file.write("2025-04-18, partial li")  # Mid-write line is left for next time
+    assert import_schedule(conn, str(words), incremental=True) == 1
+    assert word_bank(conn) == [('2025-04-17', 'other game')]
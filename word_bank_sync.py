@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Word Bank Sync
+Bulk import/export between words.txt and the word_bank table.
+
+Rows are streamed in chunks and written with one statement per chunk
+(COPY into a staging table on PostgreSQL, executemany on SQLite), so large
+backfills and small scheduler appends both cost one round trip per chunk.
+Every import also points word_today at the phrase for today in Chicago.
+
+An incremental import starts at the byte offset the previous import
+stopped at, recorded in word_bank_sync with the file's inode and a
+fingerprint of the bytes just before that offset. Lines appended since
+are imported whatever their dates, and without overwriting a date that is
+already in word_bank, because the first entry for a date wins. A replaced,
+truncated or rewritten file gets a full import instead.
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+from datetime import date, datetime
+
+import pytz
+
+from puzzle_store import SQLITE_PREFIX, connect_factory, create_sqlite_schema, placeholder
+
+CHUNK_SIZE = 5000
+
+# The day rolls over at midnight Chicago time, as in app.py
+CST = pytz.timezone('America/Chicago')
+
+INDEX_STATEMENTS = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_word_bank_puzzle_date ON word_bank (puzzle_date)",
+    "CREATE INDEX IF NOT EXISTS ix_word_bank_word ON word_bank (word)",
+    # One row: where the last import stopped reading words.txt
+    "CREATE TABLE IF NOT EXISTS word_bank_sync ("
+    " id INTEGER PRIMARY KEY, byte_offset BIGINT NOT NULL,"
+    " inode BIGINT NOT NULL, fingerprint VARCHAR(16) NOT NULL)",
+)
+
+# Bytes before the stored offset that must be unchanged to read on from there
+FINGERPRINT_SIZE = 64
+
+
+def _is_sqlite(conn):
+    return isinstance(conn, sqlite3.Connection)
+
+
+def ensure_indexes(conn):
+    """Create the date/phrase indexes and the sync state table, if missing."""
+    cursor = conn.cursor()
+    for statement in INDEX_STATEMENTS:
+        cursor.execute(statement)
+    conn.commit()
+
+
+def _fingerprint(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _complete_end(file, size):
+    """Offset just past the last newline; a line after it may be mid-write."""
+    position = size
+    while position > 0:
+        read_size = min(64 * 1024, position)
+        position -= read_size
+        file.seek(position)
+        newline = file.read(read_size).rfind(b'\n')
+        if newline >= 0:
+            return position + newline + 1
+    return 0
+
+
+def iter_schedule(words_file, start_offset=0, end_offset=None):
+    """Yield (date, phrase) pairs from ``words_file`` between two byte offsets."""
+    with open(words_file, 'rb') as file:
+        file.seek(start_offset)
+        position = start_offset
+        for raw in file:
+            position += len(raw)
+            if end_offset is not None and position > end_offset:
+                break
+            date_str, sep, phrase = raw.decode('utf-8').strip().partition(', ')
+            if sep:
+                yield date.fromisoformat(date_str), phrase
+
+
+def load_sync_state(conn):
+    """Return (byte_offset, inode, fingerprint) from the last import, or None."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT byte_offset, inode, fingerprint FROM word_bank_sync WHERE id = 1")
+    row = cursor.fetchone()
+    cursor.close()
+    return tuple(row) if row else None
+
+
+def save_sync_state(conn, byte_offset, inode, fingerprint):
+    """Record where an import stopped reading. The caller commits."""
+    p = placeholder('qmark' if _is_sqlite(conn) else 'pyformat')
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM word_bank_sync")
+    cursor.execute(
+        f"INSERT INTO word_bank_sync (id, byte_offset, inode, fingerprint) VALUES (1, {p}, {p}, {p})",
+        (byte_offset, inode, fingerprint)
+    )
+    cursor.close()
+
+
+def _resume_offset(file, st, state):
+    """Return the stored offset if the file still matches it there, else None."""
+    if state is None:
+        return None
+    byte_offset, inode, fingerprint = state
+    if st.st_ino != inode or st.st_size < byte_offset:
+        return None  # Replaced or truncated
+    check_from = max(byte_offset - FINGERPRINT_SIZE, 0)
+    file.seek(check_from)
+    if _fingerprint(file.read(byte_offset - check_from)) != fingerprint:
+        return None  # Rewritten before the point we had read to
+    return byte_offset
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def upsert_rows(conn, rows, paramstyle=None, overwrite=True):
+    """Insert (date, phrase) rows in a single round trip.
+
+    A date already in word_bank gets the new phrase with ``overwrite``, and
+    keeps its phrase otherwise.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    on_conflict = "DO UPDATE SET word = excluded.word" if overwrite else "DO NOTHING"
+    cursor = conn.cursor()
+    if _is_sqlite(conn):
+        p = placeholder(paramstyle or 'qmark')
+        cursor.executemany(
+            f"INSERT INTO word_bank (puzzle_date, word) VALUES ({p}, {p}) "
+            f"ON CONFLICT (puzzle_date) {on_conflict}",
+            [(day.isoformat(), phrase) for day, phrase in rows],
+        )
+    else:
+        buffer = io.StringIO()
+        for day, phrase in rows:
+            buffer.write(f"{day.isoformat()}\t{phrase}\n")
+        buffer.seek(0)
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS word_bank_stage "
+            "(puzzle_date DATE, word VARCHAR(50)) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert("COPY word_bank_stage (puzzle_date, word) FROM STDIN", buffer)
+        cursor.execute(
+            "INSERT INTO word_bank (puzzle_date, word) "
+            "SELECT puzzle_date, word FROM word_bank_stage "
+            f"ON CONFLICT (puzzle_date) {on_conflict}"
+        )
+    cursor.close()
+    return len(rows)
+
+
+def update_word_today(conn, day=None):
+    """Point word_today at word_bank's phrase for ``day`` (default: today).
+
+    Returns the phrase, or None if nothing is scheduled, in which case
+    word_today is left empty. The caller commits.
+    """
+    day = day or datetime.now(CST).date()
+    p = placeholder('qmark' if _is_sqlite(conn) else 'pyformat')
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT word FROM word_bank WHERE puzzle_date = {p} ORDER BY id LIMIT 1",
+        (day.isoformat(),)
+    )
+    row = cursor.fetchone()
+    cursor.execute("DELETE FROM word_today")
+    if row:
+        cursor.execute(f"INSERT INTO word_today (word) VALUES ({p})", (row[0],))
+    cursor.close()
+    return row[0] if row else None
+
+
+def import_schedule(conn, words_file='words.txt', incremental=False, chunk_size=CHUNK_SIZE):
+    """Stream ``words_file`` into word_bank. Returns the number of rows read.
+
+    Duplicate dates in the file keep their first entry, matching the web app.
+    With ``incremental`` only lines appended since the last import are read,
+    falling back to a full import if the file changed before that point.
+    """
+    ensure_indexes(conn)
+    with open(words_file, 'rb') as file:
+        st = os.fstat(file.fileno())
+        start_offset = _resume_offset(file, st, load_sync_state(conn)) if incremental else None
+        end_offset = _complete_end(file, st.st_size)
+        check_from = max(end_offset - FINGERPRINT_SIZE, 0)
+        file.seek(check_from)
+        fingerprint = _fingerprint(file.read(end_offset - check_from))
+    # Appended lines must not replace a date taken earlier in the file
+    overwrite = start_offset is None
+    start_offset = start_offset or 0
+
+    seen = set()
+
+    def first_per_date():
+        for day, phrase in iter_schedule(words_file, start_offset, end_offset):
+            if day not in seen:
+                seen.add(day)
+                yield day, phrase
+
+    written = 0
+    for chunk in _chunks(first_per_date(), chunk_size):
+        written += upsert_rows(conn, chunk, overwrite=overwrite)
+        conn.commit()
+    save_sync_state(conn, end_offset, st.st_ino, fingerprint)
+    update_word_today(conn)
+    conn.commit()
+    return written
+
+
+def export_schedule(conn, words_file='words.txt', chunk_size=CHUNK_SIZE):
+    """Write word_bank back out in words.txt format, in one ordered pass."""
+    if _is_sqlite(conn):
+        cursor = conn.cursor()
+    else:
+        cursor = conn.cursor(name='word_bank_export')  # Server-side cursor streams rows
+        cursor.itersize = chunk_size
+    cursor.execute(
+        "SELECT puzzle_date, word FROM word_bank "
+        "WHERE puzzle_date IS NOT NULL ORDER BY puzzle_date"
+    )
+
+    written = 0
+    tmp_path = f"{words_file}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as file:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            file.writelines(f"{day}, {word}\n" for day, word in rows)
+            written += len(rows)
+    cursor.close()
+    conn.rollback()
+    os.replace(tmp_path, words_file)
+    return written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Sync words.txt with the word_bank table",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 word_bank_sync.py import                         # Full backfill from words.txt
+  python3 word_bank_sync.py import --incremental           # Only lines appended since the last import
+  python3 word_bank_sync.py export --words-file out.txt    # Dump word_bank as text
+  DATABASE_URL=sqlite:///dialin.db python3 word_bank_sync.py import
+        """
+    )
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument(
+        '--database-url',
+        type=str,
+        default=os.environ.get('DATABASE_URL'),
+        help='PostgreSQL DSN or sqlite:///path (default: $DATABASE_URL)'
+    )
+    parser.add_argument(
+        '--words-file',
+        type=str,
+        default='words.txt',
+        help='Path to words file (default: words.txt)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Import only lines appended since the last import, keeping dates already in word_bank'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=CHUNK_SIZE,
+        help=f'Rows per round trip (default: {CHUNK_SIZE})'
+    )
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    connect, _ = connect_factory(args.database_url)
+    conn = connect()
+    try:
+        if args.database_url.startswith(SQLITE_PREFIX):
+            create_sqlite_schema(conn)
+        if args.command == 'import':
+            count = import_schedule(conn, args.words_file, args.incremental, args.chunk_size)
+            print(f"Imported {count} rows from {args.words_file}")
+        else:
+            count = export_schedule(conn, args.words_file, args.chunk_size)
+            print(f"Exported {count} rows to {args.words_file}")
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Word Dictionary
+Large external word lists (optionally with frequencies) in a compact,
+memory-mapped form the phrase generator can sample from.
+
+The source file is read once, one 'word' or 'word count' per line, and
+cached next to it as <source>.dict. Later runs map the cache instead of
+parsing the source, so start-up time and memory stay flat however large the
+dictionary is.
+
+Words are sorted by length and then alphabetically, so every length forms
+one run of fixed-width records: the length table gives each run's start,
+and a word's position within its run is its offset. Lookups by word use
+binary search over the run.
+
+Layout (little-endian):
+  header   magic(8) version(H) max_length(H) word_count(I) blob_size(Q)
+           source_size(Q) source_mtime_ns(Q)
+  lengths  (max_length + 1) records of first_index(I) count(I) blob_offset(Q)
+  counts   word_count frequencies (I), in word order
+  blob     the words, back to back
+"""
+
+import mmap
+import os
+import struct
+import sys
+from typing import Optional
+
+MAGIC = b'DIALDIC\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIQQQ')
+LENGTH_ENTRY = struct.Struct('<IIQ')
+COUNT = struct.Struct('<I')
+MAX_COUNT = 0xFFFFFFFF
+
+
+def default_cache_path(source):
+    return f"{source}.dict"
+
+
+def _parse_line(line):
+    parts = line.split()
+    if not parts:
+        return None, 0
+    word = parts[0].lower()
+    if not (word.isascii() and word.isalpha()):
+        return None, 0
+    count = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    return word, count
+
+
+def build_dictionary(source, output=None):
+    """Read ``source`` once and write the packed cache. Returns the word count.
+
+    Repeated words keep their largest count.
+    """
+    output = output or default_cache_path(source)
+    st = os.stat(source)
+    counts = {}
+    with open(source, 'r', encoding='utf-8', errors='replace') as file:
+        for line in file:
+            word, count = _parse_line(line)
+            if word is not None and count >= counts.get(word, 0):
+                counts[word] = count
+
+    words = sorted(counts, key=lambda word: (len(word), word))
+    max_length = len(words[-1]) if words else 0
+    lengths = bytearray(LENGTH_ENTRY.size * (max_length + 1))
+    frequencies = bytearray(COUNT.size * len(words))
+    blob = bytearray()
+    current = None
+    for index, word in enumerate(words):
+        if len(word) != current:
+            current = len(word)
+            LENGTH_ENTRY.pack_into(lengths, current * LENGTH_ENTRY.size, index, 0, len(blob))
+        first_index, count, offset = LENGTH_ENTRY.unpack_from(lengths, current * LENGTH_ENTRY.size)
+        LENGTH_ENTRY.pack_into(lengths, current * LENGTH_ENTRY.size, first_index, count + 1, offset)
+        COUNT.pack_into(frequencies, index * COUNT.size, min(counts[word], MAX_COUNT))
+        blob.extend(word.encode('ascii'))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, max_length, len(words), len(blob),
+                         st.st_size, st.st_mtime_ns)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(lengths)
+        file.write(frequencies)
+        file.write(blob)
+    os.replace(tmp_path, output)
+    return len(words)
+
+
+class LengthBucket:
+    """Read-only sequence of every dictionary word of one length.
+
+    Behaves like the tuples the generator indexes by length (len, indexing,
+    iteration, ``in``) without creating a str per word up front.
+    """
+
+    def __init__(self, dictionary, length, first_index, count, blob_offset):
+        self._dictionary = dictionary
+        self.length = length
+        self._first_index = first_index
+        self._count = count
+        self._start = dictionary._blob_start + blob_offset
+
+    def __len__(self):
+        return self._count
+
+    def _raw(self, index):
+        start = self._start + index * self.length
+        return self._dictionary._map[start:start + self.length]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("bucket index out of range")
+        return self._raw(index).decode('ascii')
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._raw(index).decode('ascii')
+
+    def index_of(self, word):
+        """Position of ``word`` in the bucket, or -1."""
+        if len(word) != self.length or not word.isascii():
+            return -1
+        target = word.encode('ascii')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._raw(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._raw(low) == target:
+            return low
+        return -1
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.index_of(word) >= 0
+
+    def frequency(self, index):
+        return self._dictionary._count_at(self._first_index + index)
+
+
+class WordDictionary:
+    """Read-only, memory-mapped view of a packed dictionary cache."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: truncated header")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.max_length, self.word_count, blob_size,
+         self.source_size, self.source_mtime_ns) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: not a word dictionary (version {FORMAT_VERSION})")
+        self._counts_start = HEADER.size + LENGTH_ENTRY.size * (self.max_length + 1)
+        self._blob_start = self._counts_start + COUNT.size * self.word_count
+        if size != self._blob_start + blob_size:
+            self._map.close()
+            raise ValueError(f"{path}: size does not match header")
+
+        self._buckets = {}
+        for length in range(1, self.max_length + 1):
+            first_index, count, offset = LENGTH_ENTRY.unpack_from(
+                self._map, HEADER.size + length * LENGTH_ENTRY.size)
+            if count:
+                self._buckets[length] = LengthBucket(self, length, first_index, count, offset)
+
+    def close(self):
+        self._buckets = {}
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.word_count
+
+    def _count_at(self, index):
+        return COUNT.unpack_from(self._map, self._counts_start + index * COUNT.size)[0]
+
+    def lengths(self):
+        return sorted(self._buckets)
+
+    def bucket(self, length) -> Optional[LengthBucket]:
+        """All words of exactly ``length`` letters, or None."""
+        return self._buckets.get(length)
+
+    def __contains__(self, word):
+        bucket = self._buckets.get(len(word))
+        return bucket is not None and word in bucket
+
+    def get(self, word, default=None):
+        """Frequency of ``word`` (0 if the source had none), like dict.get."""
+        bucket = self._buckets.get(len(word))
+        index = bucket.index_of(word) if bucket is not None else -1
+        return bucket.frequency(index) if index >= 0 else default
+
+    def is_stale(self, source):
+        """Return True if ``source`` changed since the cache was built."""
+        try:
+            st = os.stat(source)
+        except FileNotFoundError:
+            return False  # Keep using the cache if the source went away
+        return (st.st_size, st.st_mtime_ns) != (self.source_size, self.source_mtime_ns)
+
+
+def open_dictionary(source, cache=None):
+    """Map the cache for ``source``, building or rebuilding it when needed."""
+    cache = cache or default_cache_path(source)
+    try:
+        dictionary = WordDictionary(cache)
+    except (FileNotFoundError, ValueError):
+        dictionary = None
+    if dictionary is not None and not dictionary.is_stale(source):
+        return dictionary
+    if dictionary is not None:
+        dictionary.close()
+    build_dictionary(source, cache)
+    return WordDictionary(cache)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Pack a large word/frequency list for the phrase generator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 word_dictionary.py build counts.txt      # counts.txt -> counts.txt.dict
+  python3 word_dictionary.py stats counts.txt      # Words per length
+  python3 word_dictionary.py lookup counts.txt pizza
+        """
+    )
+    parser.add_argument('command', choices=['build', 'stats', 'lookup'])
+    parser.add_argument('source', help="Word list: one 'word' or 'word count' per line")
+    parser.add_argument('word', nargs='?', help='Word to look up')
+    parser.add_argument('--cache', type=str, help='Cache path (default: <source>.dict)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        count = build_dictionary(args.source, args.cache)
+        print(f"Packed {count} words into {args.cache or default_cache_path(args.source)}")
+        return
+
+    with open_dictionary(args.source, args.cache) as dictionary:
+        if args.command == 'stats':
+            print(f"{len(dictionary)} words")
+            for length in dictionary.lengths():
+                print(f"  {length:2d} letters: {len(dictionary.bucket(length))}")
+        else:
+            if args.word is None:
+                parser.error("lookup needs a word")
+            frequency = dictionary.get(args.word.lower())
+            if frequency is None:
+                print(f"'{args.word}' is not in the dictionary")
+                sys.exit(1)
+            print(f"'{args.word}' frequency {frequency}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Word Schedule
+In-memory, date-indexed view of words.txt shared by the web app and tooling,
+and the locked batch append every writer goes through.
+"""
+
+import bisect
+import fcntl
+import os
+import threading
+import time
+from datetime import date
+
+PHRASE_LENGTH = 10
+
+
+def is_complete_entry(line):
+    """True if ``line`` is a whole 'YYYY-MM-DD, phrase' entry.
+
+    Used for a last line with no newline: it is either a hand-edited file
+    missing its final newline (complete) or an append caught mid-write
+    (incomplete, and read again once the write finishes).
+    """
+    date_str, sep, phrase = line.strip().partition(', ')
+    if not sep or len(phrase) != PHRASE_LENGTH:
+        return False
+    try:
+        date.fromisoformat(date_str)
+    except ValueError:
+        return False
+    return True
+
+
+def iter_entries(text):
+    """Yield each line of ``text``, dropping a trailing line caught mid-write."""
+    lines = text.split('\n')
+    tail = lines.pop()
+    yield from lines
+    if tail and is_complete_entry(tail):
+        yield tail
+
+
+def append_entries(path, entries):
+    """Append (date, phrase) pairs to ``path`` as a single locked write.
+
+    An exclusive advisory lock keeps concurrent writers from interleaving,
+    a missing final newline is repaired first, and the data is fsynced
+    before the lock is released.
+    """
+    data = ''.join(f"{day}, {phrase}\n" for day, phrase in entries).encode('utf-8')
+    if not data:
+        return
+    with open(path, 'a+b') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            end = file.seek(0, os.SEEK_END)
+            if end > 0:
+                file.seek(end - 1)
+                if file.read(1) != b'\n':
+                    data = b'\n' + data
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class ScheduleIndex:
+    """Maps 'YYYY-MM-DD' dates to phrases, reloading when words.txt changes.
+
+    The file is parsed once and kept in a dict, so lookups are O(1). A cheap
+    os.stat() is done at most once every ``check_interval`` seconds. When the
+    file only grew, just the appended bytes are read; a new inode, a file that
+    did not grow, or changed bytes just before the old end (rotation,
+    truncation, an edit) cause a full reload.
+
+    Scheduled dates are also kept as a sorted list of ordinals, so counting
+    the days booked ahead and finding the next free date are O(log n). For
+    planning, the ordinals are collapsed into runs of consecutive booked
+    days; free slots are the gaps between runs, so a horizon is scanned one
+    interval at a time rather than one day at a time.
+    """
+
+    # Bytes just before the read offset that must be unchanged to extend
+    FINGERPRINT_SIZE = 64
+
+    def __init__(self, path='words.txt', check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._phrases = {}
+        self._ordinals = []
+        self._runs = None
+        self._run_ends = []
+        self._version = None
+        self._loaded = False
+        self._inode = None
+        self._offset = 0
+        self._fingerprint = b''
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        """(mtime_ns, size) of the loaded file, or None if it was missing."""
+        return self._version
+
+    def _stat_version(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _consume(self, data):
+        """Index raw bytes read from the current offset onwards."""
+        consumed = data.rfind(b'\n') + 1
+        for line in iter_entries(data.decode('utf-8')):
+            date_str, sep, phrase = line.strip().partition(', ')
+            # First entry for a date wins, as in the original line scan
+            if not sep or date_str in self._phrases:
+                continue
+            self._phrases[date_str] = phrase
+            try:
+                ordinal = date.fromisoformat(date_str).toordinal()
+            except ValueError:
+                continue
+            self._runs = None
+            if not self._ordinals or ordinal > self._ordinals[-1]:
+                self._ordinals.append(ordinal)  # Usual case: appended in order
+            else:
+                bisect.insort(self._ordinals, ordinal)
+        # An unterminated last line is read again next time
+        self._fingerprint = (self._fingerprint + data[:consumed])[-self.FINGERPRINT_SIZE:]
+        self._offset += consumed
+
+    def _reload(self):
+        self._phrases = {}
+        self._ordinals = []
+        self._runs = None
+        self._inode = None
+        self._offset = 0
+        self._fingerprint = b''
+        try:
+            with open(self.path, 'rb') as file:
+                self._inode = os.fstat(file.fileno()).st_ino
+                data = file.read()
+        except FileNotFoundError:
+            return
+        self._consume(data)
+
+    def _extend(self):
+        """Read only what was appended. Returns False if a reload is needed."""
+        if not self._loaded or self._inode is None:
+            return False
+        try:
+            file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+        with file:
+            st = os.fstat(file.fileno())
+            if st.st_ino != self._inode or st.st_size <= self._offset:
+                return False  # Replaced, truncated, or rewritten without growing
+            check_from = max(self._offset - len(self._fingerprint), 0)
+            file.seek(check_from)
+            if file.read(self._offset - check_from) != self._fingerprint:
+                return False
+            data = file.read()
+        self._consume(data)
+        return True
+
+    def refresh(self, force=False):
+        """Pick up changes to the file on disk. Returns True if anything was re-read."""
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+
+        with self._lock:
+            self._next_check = now + self.check_interval
+            current = self._stat_version()
+            if not force and self._loaded and current == self._version:
+                return False
+            # Stat before reading so a write that lands mid-read is picked
+            # up on the next check instead of being masked.
+            if force or not self._extend():
+                self._reload()
+            self._version = current
+            self._loaded = True
+            return True
+
+    def phrase_for(self, day):
+        """Return the phrase scheduled for ``day`` (a date or 'YYYY-MM-DD')."""
+        self.refresh()
+        if isinstance(day, date):
+            day = day.isoformat()
+        return self._phrases.get(day)
+
+    def count_after(self, day):
+        """Number of scheduled dates later than ``day``."""
+        self.refresh()
+        return len(self._ordinals) - bisect.bisect_right(self._ordinals, day.toordinal())
+
+    def next_free_date(self, after):
+        """The first date later than ``after`` with nothing scheduled."""
+        self.refresh()
+        ordinals = self._ordinals
+        start = after.toordinal() + 1
+        first = bisect.bisect_left(ordinals, start)
+        if first == len(ordinals) or ordinals[first] != start:
+            return date.fromordinal(start)
+        # Dates are unique and sorted, so ordinals[i] - i only grows and stays
+        # equal to start - first exactly while the run of booked days continues
+        low, high = first, len(ordinals)
+        while low < high:
+            middle = (low + high) // 2
+            if ordinals[middle] - middle == start - first:
+                low = middle + 1
+            else:
+                high = middle
+        return date.fromordinal(start + (low - first))
+
+    def _booked_runs(self):
+        """[(first, last)] ordinals of each run of consecutive booked days."""
+        if self._runs is None:
+            runs = []
+            for ordinal in self._ordinals:
+                if runs and ordinal == runs[-1][1] + 1:
+                    runs[-1][1] = ordinal
+                else:
+                    runs.append([ordinal, ordinal])
+            self._runs = runs
+            self._run_ends = [last for _, last in runs]
+        return self._runs
+
+    def _gaps(self, start):
+        """Yield (first, last) ordinals of each free interval from ``start`` on.
+
+        The interval after the last booked run is open-ended (last is None).
+        """
+        runs = self._booked_runs()
+        index = bisect.bisect_left(self._run_ends, start)
+        cursor = start
+        for first, last in runs[index:]:
+            if first > cursor:
+                yield cursor, first - 1
+            cursor = max(cursor, last + 1)
+        yield cursor, None
+
+    def free_slots(self, after, horizon):
+        """Free (first, last) date ranges in the ``horizon`` days after ``after``."""
+        self.refresh()
+        start = after.toordinal() + 1
+        end = start + horizon - 1
+        slots = []
+        for first, last in self._gaps(start):
+            if first > end:
+                break
+            last = end if last is None else min(last, end)
+            slots.append((date.fromordinal(first), date.fromordinal(last)))
+        return slots
+
+    def free_dates(self, after, count):
+        """The first ``count`` unbooked dates later than ``after``.
+
+        Gaps in the schedule are filled first, in date order, then dates
+        after the last booked day; no booked date is ever returned.
+        """
+        self.refresh()
+        dates = []
+        for first, last in self._gaps(after.toordinal() + 1):
+            take = count - len(dates)
+            if last is not None:
+                take = min(take, last - first + 1)
+            dates.extend(date.fromordinal(ordinal) for ordinal in range(first, first + take))
+            if len(dates) >= count:
+                break
+        return dates
+
+    def __len__(self):
+        self.refresh()
+        return len(self._phrases)
+
+    def __contains__(self, day):
+        return self.phrase_for(day) is not None